@@ -177,6 +177,16 @@ export function useWebSocket() {
               created_at: event.data.created_at as string,
               updated_at: null,
             });
+            // Long messages are broadcast as a preview; pull the full text.
+            if (event.data.content_truncated) {
+              const messageId = event.data.id as string;
+              fetch(`/api/messages/${messageId}`)
+                .then((res) => (res.ok ? res.json() : null))
+                .then((full) => {
+                  if (full) updateMessage(channelId, messageId, { content: full.content });
+                })
+                .catch(() => {});
+            }
           }
           break;
         }
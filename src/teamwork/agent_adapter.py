@@ -36,9 +36,11 @@ from __future__ import annotations
 import json
 import logging
 import os
+import re
 import shlex
 import subprocess
 from dataclasses import dataclass, field
+from functools import cached_property
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +105,15 @@ class ForeignAgent:
 
     # ── Addressing ───────────────────────────────────────────────────────────
 
+    @cached_property
+    def _mention(self) -> re.Pattern[str]:
+        """``@name`` in any case, compiled once per adapter.
+
+        Every polled message is checked, so matching case-insensitively in
+        place beats lowercasing a copy of each message to search it.
+        """
+        return re.compile(re.escape(f"@{self.name}"), re.IGNORECASE)
+
     def addressed_by(self, message: dict) -> bool:
         """Should this agent answer *message*?
 
@@ -115,8 +126,7 @@ class ForeignAgent:
             return False
         if not self.require_mention:
             return True
-        content = (message.get("content") or "").lower()
-        return f"@{self.name.lower()}" in content
+        return self._mention.search(message.get("content") or "") is not None
 
     def build_prompt(self, message: dict) -> str:
         """What the foreign agent actually sees.
@@ -125,9 +135,7 @@ class ForeignAgent:
         the speaker is labelled so it knows a human/another agent is talking to
         it rather than reading its own context back.
         """
-        content = (message.get("content") or "").strip()
-        for token in (f"@{self.name}", f"@{self.name.lower()}", f"@{self.name.upper()}"):
-            content = content.replace(token, "")
+        content = self._mention.sub("", (message.get("content") or "").strip())
         speaker = message.get("agent_name") or "user"
         return f"{speaker}: {content.strip()}"
 
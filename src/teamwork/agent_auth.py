@@ -177,6 +177,16 @@ def _parse_allow(raw) -> frozenset[str]:
     return frozenset(p for p in raw if p) or frozenset({ALL_CAPABILITIES})
 
 
+# Parsed registry files, keyed by path and tagged with the (inode, mtime,
+# size) they were parsed from. Every external API request resolves its caller
+# against the registry, and re-reading and re-parsing an unchanged file each
+# time is pure waste; a stat is enough to notice a change. Grants and
+# revocations are written with an atomic rename, so they always change the
+# inode and are picked up on the very next request. AgentClient is frozen, so
+# sharing the parsed instances between requests is safe.
+_registry_cache: dict[Path, tuple[tuple[int, int, int], list[AgentClient]]] = {}
+
+
 def load_clients(path: str | None = None, legacy_key: str | None = None) -> list[AgentClient]:
     """Build the client registry: file entries first, then the legacy shared key."""
     clients: list[AgentClient] = []
@@ -188,45 +198,27 @@ def load_clients(path: str | None = None, legacy_key: str | None = None) -> list
         # credential, and was never loaded. The symptom is the worst kind: the
         # UI says the space is enabled and every request 401s.
         p = Path(path).expanduser()
-        if not p.exists():
+        try:
+            st = p.stat()
+        except OSError:
+            _registry_cache.pop(p, None)
             logger.warning("TEAMWORK_AGENT_CLIENTS_PATH set but %s does not exist", p)
         else:
-            try:
-                entries = json.loads(p.read_text())
-            except Exception as exc:  # noqa: BLE001 - a bad registry must not 500 every request
-                logger.error("agent client registry %s is unreadable: %s", p, exc)
-                entries = []
-            for entry in entries or []:
-                name = entry.get("name") or "<unnamed>"
-                digest = entry.get("token_sha256") or (
-                    _sha256(entry["token"]) if entry.get("token") else None)
-                if not digest:
-                    logger.warning("agent client %r has no token/token_sha256 — skipped", name)
-                    continue
-                clients.append(AgentClient(
-                    name=name,
-                    token_sha256=digest,
-                    agent_id=entry.get("agent_id") or None,
-                    project_id=entry.get("project_id") or None,
-                    allow=_parse_allow(entry.get("allow")),
-                    public_key=entry.get("public_key") or None,
-                    # A client that published a key defaults to requiring
-                    # signatures: having registered one, an unsigned request
-                    # from it is more likely a downgrade attack than intent.
-                    require_signature=bool(entry.get(
-                        "require_signature", bool(entry.get("public_key")))),
-                    gated=frozenset(_parse_allow(entry["gated"]))
-                    if entry.get("gated") else frozenset(),
-                    mcp=bool(entry.get("mcp", False)),
-                    label=(entry.get("label") or "").strip(),
-                    spaces=frozenset(
-                        s.strip() for s in (
-                            entry["spaces"].split(",")
-                            if isinstance(entry.get("spaces"), str)
-                            else entry.get("spaces") or []
-                        ) if s and s.strip()
-                    ),
-                ))
+            signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+            cached = _registry_cache.get(p)
+            if cached is None or cached[0] != signature:
+                parsed = _parse_registry(p)
+                if parsed is None:
+                    # Not cached: the read may have raced a partial write, and
+                    # caching the failure would reject every agent until the
+                    # file happened to change again. The next request re-reads.
+                    _registry_cache.pop(p, None)
+                    parsed = []
+                else:
+                    _registry_cache[p] = (signature, parsed)
+            else:
+                parsed = cached[1]
+            clients.extend(parsed)
     if legacy_key:
         # Unbound on purpose: the shared key predates per-agent identity and can
         # still speak for anyone. Deployments should migrate to the registry.
@@ -235,6 +227,48 @@ def load_clients(path: str | None = None, legacy_key: str | None = None) -> list
     return clients
 
 
+def _parse_registry(p: Path) -> list[AgentClient] | None:
+    """The clients defined by the registry file at *p*, or None if it is unreadable."""
+    clients: list[AgentClient] = []
+    try:
+        entries = json.loads(p.read_text())
+    except Exception as exc:  # noqa: BLE001 - a bad registry must not 500 every request
+        logger.error("agent client registry %s is unreadable: %s", p, exc)
+        return None
+    for entry in entries or []:
+        name = entry.get("name") or "<unnamed>"
+        digest = entry.get("token_sha256") or (
+            _sha256(entry["token"]) if entry.get("token") else None)
+        if not digest:
+            logger.warning("agent client %r has no token/token_sha256 — skipped", name)
+            continue
+        clients.append(AgentClient(
+            name=name,
+            token_sha256=digest,
+            agent_id=entry.get("agent_id") or None,
+            project_id=entry.get("project_id") or None,
+            allow=_parse_allow(entry.get("allow")),
+            public_key=entry.get("public_key") or None,
+            # A client that published a key defaults to requiring
+            # signatures: having registered one, an unsigned request
+            # from it is more likely a downgrade attack than intent.
+            require_signature=bool(entry.get(
+                "require_signature", bool(entry.get("public_key")))),
+            gated=frozenset(_parse_allow(entry["gated"]))
+            if entry.get("gated") else frozenset(),
+            mcp=bool(entry.get("mcp", False)),
+            label=(entry.get("label") or "").strip(),
+            spaces=frozenset(
+                s.strip() for s in (
+                    entry["spaces"].split(",")
+                    if isinstance(entry.get("spaces"), str)
+                    else entry.get("spaces") or []
+                ) if s and s.strip()
+            ),
+        ))
+    return clients
+
+
 def resolve_client(presented: str | None, clients: list[AgentClient]) -> AgentClient | None:
     """Resolve a presented token to its client. Every candidate is checked so a
     non-match costs the same as a match (no early-out timing signal)."""
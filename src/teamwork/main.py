@@ -1,11 +1,14 @@
 """Main FastAPI application for TeamWork."""
 
 import asyncio
+import atexit
 import json
 import logging
 import os
+import queue
 import sys
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -14,11 +17,17 @@ from sqlalchemy import text
 
 from teamwork.config import settings
 
-# Configure logging to output to stdout
+# Configure logging to output to stdout. Records go through a queue to a
+# listener thread, so a slow or contended stdout never stalls the event loop —
+# the handler a coroutine calls only enqueues.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
+    handlers=[QueueHandler(_log_queue)]
 )
 # Quiet down third-party INFO chatter that fires on polling loops:
 #   - httpx/httpcore: the browser panel's tab_watcher hits
@@ -60,14 +69,14 @@ async def run_migrations():
             columns = [row[1] for row in result.fetchall()]
 
             if "workspace_dir" not in columns:
-                print("Adding workspace_dir column to projects table...")
+                logger.info("Adding workspace_dir column to projects table")
                 await db.execute(text(
                     "ALTER TABLE projects ADD COLUMN workspace_dir VARCHAR(255)"
                 ))
                 await db.commit()
-                print("Migration complete: added workspace_dir column")
+                logger.info("Migration complete: added workspace_dir column")
         except Exception as e:
-            print(f"Migration check error (may be normal on first run): {e}")
+            logger.warning("Migration check error (may be normal on first run): %s", e)
 
 
 @asynccontextmanager
@@ -84,7 +93,12 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    print(">>> Application shutting down, cleanup complete.", flush=True)
+    from teamwork.routers.messages import close_webhook_client
+    from teamwork.utils.http import close_http_client
+
+    await close_webhook_client()
+    await close_http_client()
+    logger.info("Application shutting down, cleanup complete")
 
 
 app = FastAPI(
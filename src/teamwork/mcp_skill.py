@@ -23,9 +23,15 @@ the wrong one.
 """
 from __future__ import annotations
 
+from functools import lru_cache
+
 SKILL_NAME = "teamwork-space"
 
 
+# The text depends only on its arguments, and the admin UI asks for the same
+# few spaces over and over; keep the rendered ~5 KB document rather than
+# re-formatting it on every request.
+@lru_cache(maxsize=64)
 def skill_markdown(*, space: str, space_name: str | None = None,
                    server_url: str = "https://teamwork.example.ts.net/mcp",
                    token_hint: str = "<your-key>") -> str:
@@ -1,14 +1,17 @@
 """Database base configuration and session management."""
 
+import logging
 from collections.abc import AsyncGenerator
-from sqlalchemy import event, text
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import StaticPool
 
 from teamwork.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
@@ -26,6 +29,30 @@ engine = create_async_engine(
     connect_args={"check_same_thread": False},
 )
 
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record) -> None:
+        """Per-connection SQLite settings, applied to every new connection.
+
+        busy_timeout and cache_size are connection-scoped, so setting them
+        once at init would lose them whenever the pooled connection is
+        replaced. WAL lets readers proceed during a write, and busy_timeout
+        turns lock contention into a short wait inside SQLite instead of an
+        immediate "database is locked". synchronous stays at its FULL default
+        so a committed transaction survives a power loss or OS crash.
+
+        StaticPool keeps this one connection for the life of the process, so
+        its page cache is what every request reads through; the default 2 MB
+        is small enough that message and project scans evict each other.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA cache_size=-32000")  # KiB, i.e. ~32 MB
+        cursor.close()
+
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -36,9 +63,6 @@ AsyncSessionLocal = async_sessionmaker(
 async def init_db() -> None:
     """Initialize the database by creating all tables."""
     async with engine.begin() as conn:
-        # Enable WAL mode for better concurrency
-        await conn.execute(text("PRAGMA journal_mode=WAL"))
-        await conn.execute(text("PRAGMA busy_timeout=5000"))
         await conn.run_sync(Base.metadata.create_all)
         
         # Run migrations for new columns on existing tables
@@ -57,9 +81,9 @@ async def _run_migrations(conn) -> None:
             await conn.execute(
                 text("ALTER TABLE agents ADD COLUMN specialization VARCHAR(255)")
             )
-            print("Migration: Added specialization column to agents table")
+            logger.info("Migration: Added specialization column to agents table")
         except Exception as e:
-            print(f"Migration warning: {e}")
+            logger.warning("Migration warning: %s", e)
 
     # Get existing columns in the tasks table
     result = await conn.execute(text("PRAGMA table_info(tasks)"))
@@ -71,9 +95,9 @@ async def _run_migrations(conn) -> None:
             await conn.execute(
                 text("ALTER TABLE tasks ADD COLUMN blocked_by_json TEXT DEFAULT '[]'")
             )
-            print("Migration: Added blocked_by_json column to tasks table")
+            logger.info("Migration: Added blocked_by_json column to tasks table")
         except Exception as e:
-            print(f"Migration warning: {e}")
+            logger.warning("Migration warning: %s", e)
 
     # Add start_commit column if it doesn't exist
     if "start_commit" not in columns:
@@ -81,9 +105,9 @@ async def _run_migrations(conn) -> None:
             await conn.execute(
                 text("ALTER TABLE tasks ADD COLUMN start_commit VARCHAR(40)")
             )
-            print("Migration: Added start_commit column to tasks table")
+            logger.info("Migration: Added start_commit column to tasks table")
         except Exception as e:
-            print(f"Migration warning: {e}")
+            logger.warning("Migration warning: %s", e)
 
     # Add end_commit column if it doesn't exist
     if "end_commit" not in columns:
@@ -91,9 +115,9 @@ async def _run_migrations(conn) -> None:
             await conn.execute(
                 text("ALTER TABLE tasks ADD COLUMN end_commit VARCHAR(40)")
             )
-            print("Migration: Added end_commit column to tasks table")
+            logger.info("Migration: Added end_commit column to tasks table")
         except Exception as e:
-            print(f"Migration warning: {e}")
+            logger.warning("Migration warning: %s", e)
 
     # ── FTS5 full-text search for messages ──
     await _migrate_fts5(conn)
@@ -148,7 +172,7 @@ async def _migrate_fts5(conn) -> None:
                 SELECT rowid, content FROM messages
         """))
 
-        print("Migration: Created FTS5 full-text search index for messages")
+        logger.info("Migration: Created FTS5 full-text search index for messages")
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
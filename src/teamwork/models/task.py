@@ -69,10 +69,15 @@ class Task(Base):
     @property
     def blocked_by(self) -> list[str]:
         """Get list of task IDs this task is blocked by."""
-        if not self.blocked_by_json:
+        return self.parse_blocked_by(self.blocked_by_json)
+
+    @staticmethod
+    def parse_blocked_by(raw: str | None) -> list[str]:
+        """Decode a ``blocked_by_json`` value read without loading the task."""
+        if not raw:
             return []
         try:
-            return json.loads(self.blocked_by_json)
+            return json.loads(raw)
         except (json.JSONDecodeError, TypeError):
             return []
     
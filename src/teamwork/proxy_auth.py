@@ -83,11 +83,13 @@ class ProxyAuthMiddleware(BaseHTTPMiddleware):
         self.cfg = config
         # PyJWKClient caches signing keys (network fetch only on cache miss).
         self._jwks = PyJWKClient(config.jwks_url)
+        # Checked on every request, so built once: a set for exact paths and
+        # a tuple of "<path>/" prefixes for one C-level startswith().
+        self._exempt_exact = frozenset(config.exempt)
+        self._exempt_prefixes = tuple(p.rstrip("/") + "/" for p in config.exempt)
 
     def _is_exempt(self, path: str) -> bool:
-        return any(
-            path == p or path.startswith(p.rstrip("/") + "/") for p in self.cfg.exempt
-        )
+        return path in self._exempt_exact or path.startswith(self._exempt_prefixes)
 
     def _verify(self, token: str) -> dict:
         # Blocking (JWKS fetch + crypto) — run off the event loop by the caller.
@@ -13,10 +13,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import httpx
 from fastapi import APIRouter
 
 from teamwork.config import settings
+from teamwork.utils.http import get_http_client
 
 router = APIRouter(prefix="/agent-plan", tags=["agent-plan"])
 _logger = logging.getLogger(__name__)
@@ -27,14 +27,14 @@ async def _proxy(method: str, path: str, **kwargs) -> Any:
     if not prax_url:
         return None
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.request(
-                method,
-                f"{prax_url.rstrip('/')}/teamwork/agent-plan{path}",
-                **kwargs,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await get_http_client().request(
+            method,
+            f"{prax_url.rstrip('/')}/teamwork/agent-plan{path}",
+            **kwargs,
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
     except Exception as exc:
         _logger.debug("Failed to proxy %s /agent-plan%s to Prax: %s", method, path, exc)
         return None
@@ -148,10 +148,7 @@ async def create_agent(
 ) -> AgentResponse:
     """Create a new agent."""
     # Verify project exists
-    project_result = await db.execute(
-        select(Project).where(Project.id == agent.project_id)
-    )
-    if not project_result.scalar_one_or_none():
+    if await db.get(Project, agent.project_id) is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
     db_agent = Agent(
@@ -165,7 +162,6 @@ async def create_agent(
     )
     db.add(db_agent)
     await db.flush()
-    await db.refresh(db_agent)
 
     # Broadcast agent creation
     await manager.broadcast_to_project(
@@ -185,8 +181,7 @@ async def get_agent(
     db: AsyncSession = Depends(get_db),
 ) -> AgentResponse:
     """Get an agent by ID."""
-    result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
 
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -201,8 +196,7 @@ async def update_agent_status(
     db: AsyncSession = Depends(get_db),
 ) -> AgentResponse:
     """Update an agent's status."""
-    result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
 
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -235,8 +229,7 @@ async def update_agent_profile_image(
     db: AsyncSession = Depends(get_db),
 ) -> AgentResponse:
     """Update an agent's profile image manually."""
-    result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
 
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -284,8 +277,7 @@ async def remove_agent_profile_image(
     db: AsyncSession = Depends(get_db),
 ) -> AgentResponse:
     """Remove an agent's profile image (revert to initials avatar)."""
-    result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
 
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -332,8 +324,7 @@ async def delete_agent(
     db: AsyncSession = Depends(get_db),
 ) -> None:
     """Delete an agent."""
-    result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
 
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
@@ -371,8 +362,7 @@ async def get_agent_logs(
     including task executions and code changes.
     """
     # Get agent
-    agent_result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = agent_result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -459,18 +449,12 @@ async def get_agent_prompts(
     otherwise returns prompts from the database.
     """
     # Get agent
-    result = await db.execute(
-        select(Agent).where(Agent.id == agent_id)
-    )
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
     # Get project
-    project_result = await db.execute(
-        select(Project).where(Project.id == agent.project_id)
-    )
-    project = project_result.scalar_one_or_none()
+    project = await db.get(Project, agent.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -515,18 +499,12 @@ async def update_agent_prompts(
     Also updates the database for consistency.
     """
     # Get agent
-    result = await db.execute(
-        select(Agent).where(Agent.id == agent_id)
-    )
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
     # Get project
-    project_result = await db.execute(
-        select(Project).where(Project.id == agent.project_id)
-    )
-    project = project_result.scalar_one_or_none()
+    project = await db.get(Project, agent.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -563,18 +541,12 @@ async def initialize_agent_prompts(
     Creates .agents/{agent-name}/soul.md and skills.md from the database.
     """
     # Get agent
-    result = await db.execute(
-        select(Agent).where(Agent.id == agent_id)
-    )
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
     # Get project
-    project_result = await db.execute(
-        select(Project).where(Project.id == agent.project_id)
-    )
-    project = project_result.scalar_one_or_none()
+    project = await db.get(Project, agent.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -637,8 +609,7 @@ async def get_agent_live_output(
         )
 
     # No live output yet — look up agent name from DB and return idle state
-    result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
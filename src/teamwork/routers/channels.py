@@ -1,13 +1,15 @@
 """Channels API router."""
 
 import logging
+import uuid
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import delete as sa_delete, select
+from sqlalchemy import delete as sa_delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from teamwork.models import Channel, Message, Project, get_db
+from teamwork.models import Agent, Channel, Message, Project, get_db
 from teamwork.websocket import manager, WebSocketEvent, EventType
 
 logger = logging.getLogger(__name__)
@@ -49,6 +51,13 @@ class ChannelListResponse(BaseModel):
     total: int
 
 
+# Created for every project alongside one channel per agent team.
+_DEFAULT_CHANNELS = [
+    ("general", "public", None, "General project updates and announcements"),
+    ("random", "public", None, "Off-topic discussions and team bonding"),
+]
+
+
 def channel_to_response(channel: Channel) -> ChannelResponse:
     """Convert Channel model to response schema."""
     return ChannelResponse(
@@ -71,11 +80,6 @@ async def list_channels(
     team: str | None = None,
 ) -> ChannelListResponse:
     """List channels, optionally filtered."""
-    import logging
-    import uuid
-    from sqlalchemy import text
-    logger = logging.getLogger(__name__)
-    
     query = select(Channel)
 
     if project_id:
@@ -95,79 +99,64 @@ async def list_channels(
         
         if not has_public_channels:
             # Check if user deliberately deleted channels (future feature)
-            from teamwork.models import Project, Agent
-            project_result = await db.execute(select(Project).where(Project.id == project_id))
-            project = project_result.scalar_one_or_none()
+            project = await db.get(Project, project_id)
             
             if project:
                 config = project.config or {}
                 
                 # Don't auto-create if user has explicitly deleted channels
                 if not config.get("channels_initialized_deleted", False):
-                    logger.info(f"[Channels] Project {project_id} missing public channels, creating defaults...")
+                    logger.info("[Channels] Project %s missing public channels, creating defaults...", project_id)
                     
-                    # Get team names from agents
-                    agents_result = await db.execute(select(Agent).where(Agent.project_id == project_id))
-                    agents = agents_result.scalars().all()
-                    teams = set(a.team for a in agents if a.team)
-                    
-                    # Default channels to create
-                    default_channels = [
-                        ("general", "public", None, "General project updates and announcements"),
-                        ("random", "public", None, "Off-topic discussions and team bonding"),
-                    ]
-                    
-                    # Add team channels
-                    for team_name in teams:
-                        default_channels.append(
-                            (team_name.lower().replace(" ", "-"), "team", team_name, f"{team_name} team discussions")
+                    # Only the distinct team names are needed, so select
+                    # just that column instead of loading every Agent row.
+                    teams = (
+                        await db.execute(
+                            select(Agent.team)
+                            .where(Agent.project_id == project_id, Agent.team.is_not(None), Agent.team != "")
+                            .distinct()
+                            .order_by(Agent.team)
                         )
-                    
-                    # Create channels using raw SQL (more reliable)
-                    created_channels = []
-                    for name, channel_type, team_val, description in default_channels:
-                        channel_id = str(uuid.uuid4())
-                        try:
-                            await db.execute(
-                                text("""
-                                    INSERT INTO channels (id, project_id, name, type, team, description, created_at)
-                                    VALUES (:id, :project_id, :name, :type, :team, :description, datetime('now'))
-                                """),
-                                {
-                                    "id": channel_id,
-                                    "project_id": project_id,
-                                    "name": name,
-                                    "type": channel_type,
-                                    "team": team_val,
-                                    "description": description,
-                                }
-                            )
-                            logger.info(f"[Channels] Created channel: {name} (type={channel_type})")
-                            
-                            # Create a response object for the new channel
-                            created_channels.append(Channel(
-                                id=channel_id,
-                                project_id=project_id,
-                                name=name,
-                                type=channel_type,
-                                team=team_val,
-                                description=description,
-                            ))
-                        except Exception as e:
-                            logger.error(f"[Channels] Failed to create channel {name}: {e}")
-                    
-                    await db.commit()
-                    
-                    # Mark project as having channels initialized
-                    config["channels_initialized"] = True
-                    project.config = config
+                    ).scalars().all()
+                    default_channels = _DEFAULT_CHANNELS + [
+                        (team_name.lower().replace(" ", "-"), "team", team_name, f"{team_name} team discussions")
+                        for team_name in teams
+                    ]
+
+                    # One multi-row INSERT for all of them. A failed insert
+                    # aborts the transaction anyway, so there is nothing to
+                    # gain from inserting (and catching) row by row.
+                    created_at = datetime.utcnow()
+                    rows = [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "project_id": project_id,
+                            "name": name,
+                            "type": channel_type,
+                            "team": team_val,
+                            "description": description,
+                            "created_at": created_at,
+                        }
+                        for name, channel_type, team_val, description in default_channels
+                    ]
+                    await db.execute(insert(Channel), rows)
+                    created_channels = [Channel(**row) for row in rows]
+
+                    # Mark project as having channels initialized, in the same
+                    # transaction as the channels — one commit, and never
+                    # channels without the flag. A new dict so the change to
+                    # the JSON column is seen.
+                    project.config = {**config, "channels_initialized": True}
                     await db.commit()
                     
                     # Prepend created channels to the list
                     channels = created_channels + channels
-                    logger.info(f"[Channels] Created {len(created_channels)} default channels for project {project_id}")
+                    logger.info("[Channels] Created %d default channels for project %s",
+                                len(created_channels), project_id)
     
-    logger.info(f"[Channels] Returning {len(channels)} channels for project {project_id}")
+    # Every sidebar refresh lands here, so this is debug-level and lazily
+    # formatted — nothing is built unless someone is listening.
+    logger.debug("[Channels] Returning %d channels for project %s", len(channels), project_id)
 
     return ChannelListResponse(
         channels=[channel_to_response(c) for c in channels],
@@ -182,10 +171,7 @@ async def create_channel(
 ) -> ChannelResponse:
     """Create a new channel."""
     # Verify project exists
-    project_result = await db.execute(
-        select(Project).where(Project.id == channel.project_id)
-    )
-    if not project_result.scalar_one_or_none():
+    if await db.get(Project, channel.project_id) is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
     db_channel = Channel(
@@ -198,7 +184,6 @@ async def create_channel(
     )
     db.add(db_channel)
     await db.flush()
-    await db.refresh(db_channel)
 
     # Broadcast channel creation
     await manager.broadcast_to_project(
@@ -223,11 +208,8 @@ async def get_or_create_dm_channel(
     db: AsyncSession = Depends(get_db),
 ) -> ChannelResponse:
     """Get or create a DM channel with an agent."""
-    from teamwork.models import Agent
-
     # Verify agent exists
-    agent_result = await db.execute(select(Agent).where(Agent.id == agent_id))
-    agent = agent_result.scalar_one_or_none()
+    agent = await db.get(Agent, agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
 
@@ -253,8 +235,6 @@ async def get_or_create_dm_channel(
         dm_participants=agent_id,
     )
     db.add(dm_channel)
-    await db.flush()
-    await db.refresh(dm_channel)
     await db.commit()
 
     return channel_to_response(dm_channel)
@@ -285,10 +265,7 @@ async def get_or_create_panel_channel(
         )
 
     # Verify project exists
-    project_result = await db.execute(
-        select(Project).where(Project.id == req.project_id)
-    )
-    if not project_result.scalar_one_or_none():
+    if await db.get(Project, req.project_id) is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Deterministic channel name so it's idempotent
@@ -321,8 +298,6 @@ async def get_or_create_panel_channel(
         description=panel_labels.get(req.panel, f"{req.panel.title()} Chat"),
     )
     db.add(panel_channel)
-    await db.flush()
-    await db.refresh(panel_channel)
     await db.commit()
 
     logger.info("Created panel channel %s for project %s", channel_name, req.project_id)
@@ -339,8 +314,7 @@ async def clear_channel_messages(
 
     The channel itself is preserved — only messages are removed.
     """
-    result = await db.execute(select(Channel).where(Channel.id == channel_id))
-    channel = result.scalar_one_or_none()
+    channel = await db.get(Channel, channel_id)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
@@ -365,8 +339,7 @@ async def get_channel(
     db: AsyncSession = Depends(get_db),
 ) -> ChannelResponse:
     """Get a channel by ID."""
-    result = await db.execute(select(Channel).where(Channel.id == channel_id))
-    channel = result.scalar_one_or_none()
+    channel = await db.get(Channel, channel_id)
 
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
@@ -388,8 +361,7 @@ async def update_channel(
     db: AsyncSession = Depends(get_db),
 ) -> ChannelResponse:
     """Update a channel (rename, change description, archive/unarchive)."""
-    result = await db.execute(select(Channel).where(Channel.id == channel_id))
-    channel = result.scalar_one_or_none()
+    channel = await db.get(Channel, channel_id)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
@@ -399,7 +371,6 @@ async def update_channel(
         channel.description = update.description
 
     await db.flush()
-    await db.refresh(channel)
 
     # Broadcast update
     await manager.broadcast_to_project(
@@ -420,8 +391,7 @@ async def delete_channel(
     db: AsyncSession = Depends(get_db),
 ) -> None:
     """Delete a channel. Optionally purge all messages (default: true)."""
-    result = await db.execute(select(Channel).where(Channel.id == channel_id))
-    channel = result.scalar_one_or_none()
+    channel = await db.get(Channel, channel_id)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
@@ -2,12 +2,13 @@
 
 import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from teamwork.agent_signing import SignatureError, verify_envelope
@@ -24,9 +25,28 @@ from teamwork.agent_auth import (
     load_clients,
     resolve_client,
 )
-from teamwork.models import Project, Agent, Channel, Message, Task, get_db, AsyncSessionLocal
-from teamwork.services.event_log import append_event
+from teamwork.config import settings
+from teamwork.models import (
+    ActivityLog,
+    Agent,
+    AsyncSessionLocal,
+    Channel,
+    Message,
+    Project,
+    Task,
+    get_db,
+)
+from teamwork.services.approvals import consume, decide, list_pending, request_approval
+from teamwork.services.event_log import append_event, head_seq, read_events, verify_chain
+from teamwork.services.membership import (
+    add_member,
+    ensure_dm,
+    list_members,
+    may_post,
+    remove_member,
+)
 from teamwork.routers.agents import get_live_output_store, _LiveOutputEntry
+from teamwork.routers.messages import broadcast_content
 from teamwork.websocket import manager, WebSocketEvent, EventType
 
 logger = logging.getLogger(__name__)
@@ -125,8 +145,6 @@ def _resolve_client(x_api_key: str | None) -> AgentClient:
     "no key configured = accept anything" default meant an internet-reachable
     TeamWork accepted any caller as any agent.
     """
-    from teamwork.config import settings
-
     clients = load_clients(getattr(settings, "agent_clients_path", "") or None,
                            getattr(settings, "external_api_key", "") or None)
     if not clients:
@@ -156,8 +174,6 @@ async def _verify_api_key(
     the token proves possession of a shared string, the signature proves this
     *specific* request came from the key holder.
     """
-    from teamwork.config import settings
-
     client = _resolve_client(x_api_key)
     signature = request.headers.get("X-Agent-Signature")
     globally_required = getattr(settings, "require_signed_requests", False)
@@ -220,8 +236,6 @@ async def require_approval(
     if not client.needs_approval(capability):
         return
 
-    from teamwork.services.approvals import consume, request_approval
-
     presented = http_request.headers.get("X-Approval-Id")
     if presented:
         ok, why = await consume(db, approval_id=presented, capability=capability,
@@ -269,28 +283,35 @@ async def list_external_projects(
 ) -> list[dict[str, Any]]:
     """List all external-mode projects."""
     result = await db.execute(select(Project).where(Project.status == "active"))
-    projects = []
-    for p in result.scalars().all():
-        config = p.config or {}
-        if config.get("project_type") == "external":
-            # Fetch channels for this project
-            ch_result = await db.execute(
-                select(Channel).where(Channel.project_id == p.id)
-            )
-            channels = {ch.name: ch.id for ch in ch_result.scalars().all()}
-            # Fetch agents for this project
-            ag_result = await db.execute(
-                select(Agent).where(Agent.project_id == p.id)
-            )
-            agents = {ag.name: ag.id for ag in ag_result.scalars().all()}
-            projects.append({
-                "project_id": p.id,
-                "name": p.name,
-                "channels": channels,
-                "agents": agents,
-                "webhook_url": config.get("webhook_url", ""),
-            })
-    return projects
+    external = [p for p in result.scalars().all()
+                if (p.config or {}).get("project_type") == "external"]
+    if not external:
+        return []
+
+    # Two IN queries for every project's channels and agents, instead of two
+    # SELECTs per project — the orchestrator polls this on startup.
+    ids = [p.id for p in external]
+    channels: dict[str, dict[str, str]] = defaultdict(dict)
+    for project_id, name, channel_id in await db.execute(
+        select(Channel.project_id, Channel.name, Channel.id).where(Channel.project_id.in_(ids))
+    ):
+        channels[project_id][name] = channel_id
+    agents: dict[str, dict[str, str]] = defaultdict(dict)
+    for project_id, name, agent_id in await db.execute(
+        select(Agent.project_id, Agent.name, Agent.id).where(Agent.project_id.in_(ids))
+    ):
+        agents[project_id][name] = agent_id
+
+    return [
+        {
+            "project_id": p.id,
+            "name": p.name,
+            "channels": channels[p.id],
+            "agents": agents[p.id],
+            "webhook_url": p.config.get("webhook_url", ""),
+        }
+        for p in external
+    ]
 
 
 @router.post("/projects", status_code=201)
@@ -320,8 +341,6 @@ async def create_external_project(
     )
     project.workspace_dir = request.workspace_dir or project.get_workspace_dir_name()
     db.add(project)
-    await db.flush()
-    await db.refresh(project)
 
     # Create default channels
     channels_to_create = [
@@ -331,21 +350,13 @@ async def create_external_project(
         ("discord", "public", None, "Mirrored conversations from Discord"),
         ("sms", "public", None, "Mirrored conversations from SMS/Twilio"),
     ]
-    created_channels = {}
-    for name, ch_type, team, description in channels_to_create:
-        channel = Channel(
-            project_id=project.id,
-            name=name,
-            type=ch_type,
-            team=team,
-            description=description,
-        )
-        db.add(channel)
-        await db.flush()
-        await db.refresh(channel)
-        created_channels[name] = channel.id
-
+    channels = [
+        Channel(project_id=project.id, name=name, type=ch_type, team=team, description=description)
+        for name, ch_type, team, description in channels_to_create
+    ]
+    db.add_all(channels)
     await db.commit()
+    created_channels = {channel.name: channel.id for channel in channels}
 
     logger.info("Created external project %s (%s)", project.name, project.id)
     return {
@@ -402,9 +413,10 @@ async def ensure_channels(
     )
     existing = {ch.name: ch.id for ch in ch_result.scalars().all()}
 
+    created: dict[str, Channel] = {}
     for ch_spec in request.channels:
         name = ch_spec.get("name", "")
-        if not name or name in existing:
+        if not name or name in existing or name in created:
             continue
         channel = Channel(
             project_id=project.id,
@@ -413,12 +425,12 @@ async def ensure_channels(
             description=ch_spec.get("description", ""),
         )
         db.add(channel)
-        await db.flush()
-        await db.refresh(channel)
-        existing[name] = channel.id
+        created[name] = channel
         logger.info("Created missing channel #%s for project %s", name, project.id)
 
+    # One flush for every missing channel; ids are assigned as it runs.
     await db.commit()
+    existing.update((name, channel.id) for name, channel in created.items())
     return {"channels": existing}
 
 
@@ -442,8 +454,6 @@ async def create_external_agent(
         status="idle",
     )
     db.add(agent)
-    await db.flush()
-    await db.refresh(agent)
     await db.commit()
 
     # Broadcast agent creation
@@ -517,12 +527,9 @@ async def send_external_message(
     # Capabilities say *what* an agent may do; membership says *where*. An agent
     # holding message.post should still not be able to speak in a channel it was
     # never put in.
-    from teamwork.config import settings as _settings
-    from teamwork.services.membership import may_post
-
     ok, why = await may_post(
         db, channel_id=request.channel_id, agent_id=acting_agent_id,
-        enforce=getattr(_settings, "enforce_channel_membership", False))
+        enforce=getattr(settings, "enforce_channel_membership", False))
     if not ok:
         logger.warning("client %r refused posting to channel %s: %s",
                        api_key.name, request.channel_id, why)
@@ -538,16 +545,20 @@ async def send_external_message(
             raise HTTPException(status_code=404, detail="Agent not found in this project")
         agent_name = agent.name
 
-    message = Message(
-        channel_id=request.channel_id,
-        agent_id=acting_agent_id,
-        content=request.content,
-        message_type=request.message_type,
-        extra_data=request.extra_data,
-    )
-    db.add(message)
-    await db.flush()
-    await db.refresh(message)
+    # The INSERT returns the generated id and timestamp — no flush/refresh.
+    message_id, created_at = (
+        await db.execute(
+            insert(Message)
+            .values(
+                channel_id=request.channel_id,
+                agent_id=acting_agent_id,
+                content=request.content,
+                message_type=request.message_type,
+                extra_data=request.extra_data,
+            )
+            .returning(Message.id, Message.created_at)
+        )
+    ).one()
     # Record it in the ordered audit log before committing, so the message and
     # its log entry land in the same transaction — one cannot exist without the
     # other. The content is not copied in: the log says what happened and who
@@ -555,7 +566,7 @@ async def send_external_message(
     await append_event(
         db, event_type="message.posted", actor_type="agent" if acting_agent_id else "system",
         actor_id=acting_agent_id, actor_name=agent_name or api_key.name,
-        project_id=project_id, subject_id=message.id,
+        project_id=project_id, subject_id=message_id,
         payload={"channel_id": request.channel_id, "message_type": request.message_type,
                  "content_length": len(request.content or "")},
         signature=http_request.headers.get("X-Agent-Signature"),
@@ -566,21 +577,20 @@ async def send_external_message(
     msg_event = WebSocketEvent(
         type=EventType.MESSAGE_NEW,
         data={
-            "id": message.id,
-            "channel_id": message.channel_id,
-            "agent_id": message.agent_id,
+            "id": message_id,
+            "channel_id": request.channel_id,
+            "agent_id": acting_agent_id,
             "agent_name": agent_name,
-            "content": message.content,
-            "message_type": message.message_type,
-            "created_at": message.created_at.isoformat(),
-            **({"extra_data": message.extra_data} if message.extra_data else {}),
+            **broadcast_content(request.content),
+            "message_type": request.message_type,
+            "created_at": created_at,
+            **({"extra_data": request.extra_data} if request.extra_data else {}),
         },
     )
-    # Broadcast to both channel AND project subscribers (frontend may use either).
-    await manager.broadcast_to_channel(request.channel_id, msg_event)
-    await manager.broadcast_to_project(project_id, msg_event)
+    # Reach channel AND project subscribers (frontend may use either).
+    await manager.broadcast_to_channel_and_project(request.channel_id, project_id, msg_event)
 
-    return {"message_id": message.id}
+    return {"message_id": message_id}
 
 
 @router.delete("/projects/{project_id}/channels/{channel_id}/messages")
@@ -595,7 +605,6 @@ async def clear_channel_messages(
     await require_approval(db, api_key, CAP_MESSAGE_DELETE, http_request=http_request,
                            project_id=project_id, payload={"channel_id": channel_id})
     await _get_external_project(project_id, db)
-    from sqlalchemy import delete
     result = await db.execute(
         delete(Message).where(Message.channel_id == channel_id)
     )
@@ -612,7 +621,6 @@ async def get_channel_message_count(
 ) -> dict[str, int]:
     """Return the number of messages in a channel (used by sync to avoid duplicates)."""
     await _get_external_project(project_id, db)
-    from sqlalchemy import func
     result = await db.execute(
         select(func.count(Message.id)).where(Message.channel_id == channel_id)
     )
@@ -640,29 +648,33 @@ async def bulk_import_messages(
     await _get_external_project(project_id, db)
 
     # Validate all channel_ids belong to this project
-    ch_result = await db.execute(
-        select(Channel).where(Channel.project_id == project_id)
+    valid_channels = set(
+        (await db.scalars(select(Channel.id).where(Channel.project_id == project_id))).all()
     )
-    valid_channels = {ch.id for ch in ch_result.scalars().all()}
-
-    imported = 0
-    for item in request.messages:
-        if item.channel_id not in valid_channels:
-            continue
 
-        msg = Message(
-            channel_id=item.channel_id,
-            agent_id=item.agent_id,
-            content=item.content,
-            message_type=item.message_type,
-        )
-        # Override created_at if provided (for preserving original timestamps)
-        if item.created_at:
-            msg.created_at = datetime.fromisoformat(item.created_at.replace("Z", "+00:00"))
-        db.add(msg)
-        imported += 1
-
-    await db.flush()
+    # One executemany INSERT rather than an ORM object per message: nothing
+    # here is read back, so the unit of work would only add overhead. Every
+    # row carries the same keys, so created_at is always given — the original
+    # timestamp when provided, otherwise now.
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "channel_id": item.channel_id,
+            "agent_id": item.agent_id,
+            "content": item.content,
+            "message_type": item.message_type,
+            "created_at": (
+                datetime.fromisoformat(item.created_at.replace("Z", "+00:00"))
+                if item.created_at else now
+            ),
+        }
+        for item in request.messages
+        if item.channel_id in valid_channels
+    ]
+    imported = len(rows)
+    if rows:
+        await db.execute(insert(Message), rows)
     await db.commit()
 
     logger.info("Bulk imported %d messages into project %s", imported, project_id)
@@ -695,9 +707,8 @@ async def send_typing_indicator(
             "is_typing": request.is_typing,
         },
     )
-    # Broadcast to both channel AND project subscribers.
-    await manager.broadcast_to_channel(request.channel_id, typing_event)
-    await manager.broadcast_to_project(project_id, typing_event)
+    # Reach channel AND project subscribers.
+    await manager.broadcast_to_channel_and_project(request.channel_id, project_id, typing_event)
     return {"status": "sent"}
 
 
@@ -773,8 +784,6 @@ async def create_external_task(
         status=request.status,
     )
     db.add(task)
-    await db.flush()
-    await db.refresh(task)
     await db.commit()
 
     await manager.broadcast_to_project(
@@ -841,10 +850,7 @@ async def update_external_task(
 
 async def _get_external_project(project_id: str, db: AsyncSession) -> Project:
     """Verify the project exists and is in external mode."""
-    result = await db.execute(
-        select(Project).where(Project.id == project_id)
-    )
-    project = result.scalar_one_or_none()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -878,7 +884,6 @@ async def create_activity_log(
     require_capability(api_key, CAP_ACTIVITY_WRITE)
     await _get_external_project(project_id, db)
 
-    from teamwork.models import ActivityLog
     log = ActivityLog(
         agent_id=request.agent_id,
         activity_type=request.activity_type,
@@ -905,8 +910,6 @@ async def list_events(
     did it" across every agent — the per-table views each answer only their own
     slice.
     """
-    from teamwork.services.event_log import head_seq, read_events
-
     events = await read_events(db, project_id=project_id, event_type=event_type,
                                since_seq=since_seq, limit=limit)
     return {
@@ -943,8 +946,6 @@ async def verify_event_chain(
     notarisation: anyone with database write access could recompute the whole
     chain, which would need an externally anchored head hash to detect.
     """
-    from teamwork.services.event_log import verify_chain
-
     return await verify_chain(db, limit=limit)
 
 
@@ -962,8 +963,6 @@ async def list_approvals(
     api_key: AgentClient = Depends(_verify_api_key),
 ) -> dict[str, Any]:
     """Actions waiting on a decision — what a human needs to look at."""
-    from teamwork.services.approvals import list_pending
-
     pending = await list_pending(db, project_id=project_id)
     return {"pending": [
         {
@@ -994,8 +993,6 @@ async def decide_approval(
     presenting this approval. Nothing is executed on the agent's behalf here, so
     there is no queue of half-run intentions to reconcile.
     """
-    from teamwork.services.approvals import decide
-
     try:
         req = await decide(db, approval_id=approval_id, approve=request.approve,
                            decided_by=request.decided_by, note=request.note)
@@ -1032,8 +1029,6 @@ async def get_channel_members(
     api_key: AgentClient = Depends(_verify_api_key),
 ) -> dict[str, Any]:
     """Who is in this channel — agents and humans, same shape."""
-    from teamwork.services.membership import list_members
-
     return {"members": [
         {"member_type": m.member_type, "member_id": m.member_id,
          "member_name": m.member_name, "role": m.role,
@@ -1051,8 +1046,6 @@ async def add_channel_member(
 ) -> dict[str, Any]:
     """Put an agent (or human) in a channel."""
     require_capability(api_key, CAP_PROJECT_WRITE)
-    from teamwork.services.membership import add_member
-
     member = await add_member(
         db, channel_id=request.channel_id, member_id=request.member_id,
         member_type=request.member_type, member_name=request.member_name,
@@ -1073,8 +1066,6 @@ async def remove_channel_member(
 ) -> dict[str, Any]:
     """Remove an occupant. The membership event stays in the log."""
     require_capability(api_key, CAP_PROJECT_WRITE)
-    from teamwork.services.membership import remove_member
-
     removed = await remove_member(db, channel_id=channel_id, member_id=member_id,
                                   member_type=member_type, project_id=project_id)
     await db.commit()
@@ -1095,8 +1086,6 @@ async def open_dm(
     coordination chatter or coordinates invisibly through the orchestrator.
     """
     require_capability(api_key, CAP_PROJECT_WRITE)
-    from teamwork.services.membership import ensure_dm
-
     channel = await ensure_dm(db, project_id=project_id, agent_a=request.agent_a,
                               agent_b=request.agent_b, name_a=request.name_a,
                               name_b=request.name_b)
@@ -12,10 +12,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Body, File, UploadFile, HTTPException
 
 from teamwork.config import settings
+from teamwork.utils.http import get_http_client
 
 router = APIRouter(prefix="/library", tags=["library"])
 _logger = logging.getLogger(__name__)
@@ -29,14 +29,14 @@ async def _proxy(method: str, path: str, **kwargs) -> Any:
     if not prax_url:
         return None
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.request(
-                method,
-                f"{prax_url.rstrip('/')}{_PRAX_BASE}{path}",
-                **kwargs,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await get_http_client().request(
+            method,
+            f"{prax_url.rstrip('/')}{_PRAX_BASE}{path}",
+            **kwargs,
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
     except Exception as exc:
         _logger.debug("Failed to proxy %s %s to Prax: %s", method, path, exc)
         return None
@@ -531,20 +531,19 @@ async def get_space_cover(space: str):
     prax_url = settings.prax_url
     if not prax_url:
         raise HTTPException(status_code=502, detail="Prax backend unavailable")
-    import httpx
     from fastapi.responses import Response
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(
-                f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/cover",
-            )
-            if resp.status_code == 404:
-                return {"error": "No cover image"}
-            resp.raise_for_status()
-            return Response(
-                content=resp.content,
-                media_type=resp.headers.get("content-type", "image/png"),
-            )
+        resp = await get_http_client().get(
+            f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/cover",
+            timeout=30.0,
+        )
+        if resp.status_code == 404:
+            return {"error": "No cover image"}
+        resp.raise_for_status()
+        return Response(
+            content=resp.content,
+            media_type=resp.headers.get("content-type", "image/png"),
+        )
     except Exception as exc:
         _logger.debug("Failed to proxy space cover: %s", exc)
         raise HTTPException(status_code=502, detail="Prax backend unavailable")
@@ -600,13 +599,13 @@ async def upload_space_file(space: str, file: UploadFile = File(...)):
         return JSONResponse({"error": "Prax backend unavailable"}, status_code=502)
     try:
         content = await file.read()
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/files",
-                files={"file": (file.filename, content, file.content_type or "application/octet-stream")},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await get_http_client().post(
+            f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/files",
+            files={"file": (file.filename, content, file.content_type or "application/octet-stream")},
+            timeout=60.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
     except Exception as exc:
         _logger.debug("Failed to proxy file upload: %s", exc)
         return JSONResponse({"error": "Prax backend unavailable"}, status_code=502)
@@ -621,18 +620,18 @@ async def get_space_file(space: str, filename: str):
     if not prax_url:
         raise HTTPException(status_code=502, detail="Prax backend unavailable")
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(
-                f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/files/{filename}",
-            )
-            if resp.status_code == 404:
-                return {"error": "File not found"}
-            resp.raise_for_status()
-            return Response(
-                content=resp.content,
-                media_type=resp.headers.get("content-type", "application/octet-stream"),
-                headers={"Content-Disposition": f'inline; filename="{filename}"'},
-            )
+        resp = await get_http_client().get(
+            f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/files/{filename}",
+            timeout=30.0,
+        )
+        if resp.status_code == 404:
+            return {"error": "File not found"}
+        resp.raise_for_status()
+        return Response(
+            content=resp.content,
+            media_type=resp.headers.get("content-type", "application/octet-stream"),
+            headers={"Content-Disposition": f'inline; filename="{filename}"'},
+        )
     except Exception as exc:
         _logger.debug("Failed to proxy space file download: %s", exc)
         raise HTTPException(status_code=502, detail="Prax backend unavailable")
@@ -747,13 +746,13 @@ async def space_chat(space: str, data: dict = Body(...)):
     if not prax_url:
         raise HTTPException(status_code=502, detail="Prax backend unavailable")
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/chat",
-                json=data,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await get_http_client().post(
+            f"{prax_url.rstrip('/')}{_PRAX_BASE}/spaces/{space}/chat",
+            json=data,
+            timeout=120.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
     except Exception as exc:
         _logger.debug("Space chat proxy failed: %s", exc)
         raise HTTPException(status_code=502, detail="Prax backend unavailable")
@@ -5,19 +5,31 @@ the external agent (e.g. Prax) via the external API.  This router only handles
 message persistence, retrieval, WebSocket broadcasting, and webhook forwarding.
 """
 
+import asyncio
+import json
 import logging
+import os
+import time
 import uuid
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from typing import Any
 
 import httpx
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy import delete, func, select, text
+from pydantic import BaseModel, Field
+from sqlalchemy import (
+    Row, Select, case, delete, exists, func, insert, literal, null, select, text, union_all, update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from teamwork.config import settings
-from teamwork.models import Message, Channel, Agent, Project, Task, get_db, AsyncSessionLocal
+from teamwork.models import (
+    ActivityLog, Message, Channel, Agent, Project, Task, get_db, AsyncSessionLocal,
+)
+from teamwork.utils.http import get_http_client
+from teamwork.utils.workspace import get_project_workspace_path
 from teamwork.websocket import manager, WebSocketEvent, EventType
 
 logger = logging.getLogger(__name__)
@@ -25,6 +37,16 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/messages", tags=["messages"])
 
 
+# Longest message the chat endpoint accepts. Every post is stored and then
+# broadcast, so an unbounded body is an unbounded write to every subscriber.
+MAX_MESSAGE_CHARS = 64_000
+
+# How much of a message a WebSocket broadcast carries. Longer messages go out
+# as a preview flagged ``content_truncated``; the UI fetches the rest from
+# GET /messages/{id}, so a huge post costs each subscriber one preview.
+BROADCAST_PREVIEW_CHARS = 2_000
+
+
 # ─── Schemas ──────────────────────────────────────────────────────────────────
 
 
@@ -32,7 +54,7 @@ class MessageCreate(BaseModel):
     """Schema for creating a message."""
     channel_id: str
     agent_id: str | None = None
-    content: str
+    content: str = Field(max_length=MAX_MESSAGE_CHARS)
     message_type: str = "chat"
     extra_data: dict | None = None
     thread_id: str | None = None
@@ -72,43 +94,100 @@ class MessageListResponse(BaseModel):
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
 
-async def message_to_response(
-    message: Message, db: AsyncSession, include_reply_count: bool = True
-) -> MessageResponse:
-    """Convert Message model to response schema."""
-    agent_name = None
-    agent_role = None
+def broadcast_content(content: str) -> dict[str, Any]:
+    """The ``content`` fields of a message:new payload, preview-capped."""
+    if len(content) <= BROADCAST_PREVIEW_CHARS:
+        return {"content": content}
+    return {"content": content[:BROADCAST_PREVIEW_CHARS], "content_truncated": True}
 
-    if message.agent_id:
-        agent_result = await db.execute(
-            select(Agent).where(Agent.id == message.agent_id)
+
+def message_rows(*where) -> Select:
+    """SELECT the columns of a message response, sender already joined in.
+
+    Rows come back as plain tuples, so a listing neither hydrates ORM
+    instances nor makes a second query for sender names.
+    """
+    return (
+        select(
+            Message.id,
+            Message.channel_id,
+            Message.agent_id,
+            Agent.name.label("agent_name"),
+            Agent.role.label("agent_role"),
+            Message.content,
+            Message.message_type,
+            Message.extra_data,
+            Message.thread_id,
+            Message.created_at,
+            Message.updated_at,
         )
-        agent = agent_result.scalar_one_or_none()
-        if agent:
-            agent_name = agent.name
-            agent_role = agent.role
+        .outerjoin(Agent, Agent.id == Message.agent_id)
+        .where(*where)
+    )
+
 
-    reply_count = 0
+async def messages_to_responses(
+    rows: Sequence[Row], db: AsyncSession, include_reply_count: bool = True
+) -> list[MessageResponse]:
+    """Convert rows from :func:`message_rows` to response schemas.
+
+    Reply counts are fetched for the whole batch with one grouped COUNT,
+    then every response is built in a single pass with no further awaits.
+    """
+    if not rows:
+        return []
+
+    reply_counts: dict[str, int] = {}
     if include_reply_count:
         reply_result = await db.execute(
-            select(Message).where(Message.thread_id == message.id)
+            select(Message.thread_id, func.count())
+            .where(Message.thread_id.in_([r.id for r in rows]))
+            .group_by(Message.thread_id)
         )
-        reply_count = len(reply_result.scalars().all())
+        reply_counts = dict(reply_result.all())
+
+    return [
+        MessageResponse(
+            id=r.id,
+            channel_id=r.channel_id,
+            agent_id=r.agent_id,
+            agent_name=r.agent_name,
+            agent_role=r.agent_role,
+            content=r.content,
+            message_type=r.message_type,
+            extra_data=r.extra_data,
+            thread_id=r.thread_id,
+            reply_count=reply_counts.get(r.id, 0),
+            created_at=r.created_at.isoformat(),
+            updated_at=r.updated_at.isoformat() if r.updated_at else None,
+        )
+        for r in rows
+    ]
 
-    return MessageResponse(
-        id=message.id,
-        channel_id=message.channel_id,
-        agent_id=message.agent_id,
-        agent_name=agent_name,
-        agent_role=agent_role,
-        content=message.content,
-        message_type=message.message_type,
-        extra_data=message.extra_data,
-        thread_id=message.thread_id,
-        reply_count=reply_count,
-        created_at=message.created_at.isoformat(),
-        updated_at=message.updated_at.isoformat() if message.updated_at else None,
-    )
+
+# One client for every forwarded message, so the connection to the agent's
+# webhook is kept alive between posts instead of being set up (TCP, and TLS for
+# an https webhook) once per user message. It is kept apart from the shared
+# client in teamwork.utils.http: webhook URLs are user-configured, and nothing
+# they send back should share a pool or cookie jar with Prax or the summarizer.
+# Closed from the app lifespan; the next forward after that opens a fresh one.
+_webhook_client: httpx.AsyncClient | None = None
+
+
+def _get_webhook_client() -> httpx.AsyncClient:
+    """Return the shared webhook client, creating it on first use."""
+    global _webhook_client
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = httpx.AsyncClient(timeout=30.0)
+    return _webhook_client
+
+
+async def close_webhook_client() -> None:
+    """Close the shared webhook client, if one was opened."""
+    global _webhook_client
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+        _webhook_client = None
 
 
 async def _forward_to_external_webhook(
@@ -136,67 +215,142 @@ async def _forward_to_external_webhook(
             payload["space_slug"] = space_slug
         if extra_data:
             payload["extra_data"] = extra_data
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            await client.post(webhook_url, json=payload)
+        await _get_webhook_client().post(webhook_url, json=payload)
     except Exception as e:
         logger.error("Failed to forward message to webhook %s: %s", webhook_url, e)
         try:
-            async with AsyncSessionLocal() as db:
-                error_msg = Message(
-                    channel_id=channel_id,
-                    content=f"[System] Failed to reach external agent: {e}",
-                    message_type="system",
-                )
-                db.add(error_msg)
-                await db.flush()
-                await db.refresh(error_msg)
-                await db.commit()
-                await manager.broadcast_to_channel(
-                    channel_id,
-                    WebSocketEvent(
-                        type=EventType.MESSAGE_NEW,
-                        data={
-                            "id": error_msg.id,
-                            "channel_id": channel_id,
-                            "content": error_msg.content,
-                            "message_type": "system",
-                            "created_at": error_msg.created_at.isoformat(),
-                        },
-                    ),
-                )
+            await _post_system_message(
+                channel_id, f"[System] Failed to reach external agent: {e}"
+            )
         except Exception:
-            pass
+            logger.exception("Failed to post webhook error to channel %s", channel_id)
+
+
+async def _insert_system_message(
+    db: AsyncSession, channel_id: str, content: str
+) -> tuple[str, datetime]:
+    """INSERT a system message in the caller's transaction; returns (id, created_at)."""
+    row = (
+        await db.execute(
+            insert(Message)
+            .values(channel_id=channel_id, content=content, message_type="system")
+            .returning(Message.id, Message.created_at)
+        )
+    ).one()
+    return row[0], row[1]
 
 
 async def _post_system_message(channel_id: str, content: str) -> None:
-    """Post a system message to a channel and broadcast via WebSocket."""
+    """Post a system message to a channel and broadcast via WebSocket.
+
+    The session is held for the insert only; the broadcast, which awaits a
+    send per subscriber, runs after it is released.
+    """
     async with AsyncSessionLocal() as db:
-        msg = Message(
-            channel_id=channel_id,
-            content=content,
-            message_type="system",
-        )
-        db.add(msg)
-        await db.flush()
-        await db.refresh(msg)
+        message_id, created_at = await _insert_system_message(db, channel_id, content)
         await db.commit()
-        await manager.broadcast_to_channel(
-            channel_id,
-            WebSocketEvent(
-                type=EventType.MESSAGE_NEW,
-                data={
-                    "id": msg.id,
-                    "channel_id": channel_id,
-                    "content": msg.content,
-                    "message_type": "system",
-                    "created_at": msg.created_at.isoformat(),
-                },
-            ),
-        )
+    await _broadcast_system_message(channel_id, message_id, content, created_at)
+
+
+async def _broadcast_system_message(
+    channel_id: str, message_id: str, content: str, created_at: datetime
+) -> None:
+    await manager.broadcast_to_channel(
+        channel_id,
+        WebSocketEvent(
+            type=EventType.MESSAGE_NEW,
+            data={
+                "id": message_id,
+                "channel_id": channel_id,
+                **broadcast_content(content),
+                "message_type": "system",
+                "created_at": created_at,
+            },
+        ),
+    )
 
 
 # ─── Data aggregation (no AI — used by external agents via internal imports) ─
 
+# Directories never worth reporting as agent output. They are pruned before
+# descent, so a workspace with a large node_modules or .venv costs nothing.
+_IGNORED_WORKSPACE_DIRS = {".git", "__pycache__", "node_modules", ".venv"}
+
+
+_NO_WORK_SUMMARY = (
+    "No work has been done yet. No tasks completed, no files created, "
+    "no activities recorded."
+)
+
+
+def _list_workspace_files(root: str, limit: int) -> list[str]:
+    """Up to ``limit`` file paths under ``root``, relative to it.
+
+    Walks with ``os.scandir`` so entry types come from the directory read
+    itself, and stops as soon as ``limit`` files are found.
+    """
+    files: list[str] = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _IGNORED_WORKSPACE_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append(os.path.relpath(entry.path, root))
+                    if len(files) >= limit:
+                        return files
+    return files
+
+
+# The file listing is per project, not per agent, yet an orchestrator asks
+# for every responding agent's status back to back.  Keep each workspace's
+# listing for a couple of seconds so a burst walks the tree once.
+_WORKSPACE_LISTING_TTL = 2.0
+_workspace_listings: dict[str, tuple[float, list[str]]] = {}
+
+
+def _cached_workspace_files(root: str) -> list[str]:
+    now = time.monotonic()
+    cached = _workspace_listings.get(root)
+    if cached and now - cached[0] < _WORKSPACE_LISTING_TTL:
+        return list(cached[1])
+    files = _list_workspace_files(root, 20)
+    _workspace_listings[root] = (now, files)
+    return list(files)
+
+
+# Walks currently running, by root. The TTL cache above only helps once a
+# walk has finished; status requests for several agents tend to arrive
+# together, and each would otherwise miss it and start its own walk.
+_workspace_walks: dict[str, asyncio.Future[list[str]]] = {}
+
+
+async def _workspace_files(root: str) -> list[str]:
+    """The workspace listing, with concurrent callers sharing one walk."""
+    walk = _workspace_walks.get(root)
+    if walk is None:
+        walk = asyncio.ensure_future(asyncio.to_thread(_workspace_files_or_empty, root))
+        _workspace_walks[root] = walk
+        walk.add_done_callback(lambda _: _workspace_walks.pop(root, None))
+    # Shielded: one caller going away must not cancel the others' walk.
+    return list(await asyncio.shield(walk))
+
+
+def _workspace_files_or_empty(root: str) -> list[str]:
+    # A project without a workspace directory is common, so the walk is
+    # simply attempted — a missing directory fails on its first read, which
+    # saves a separate exists() stat on every call. Any other I/O error is
+    # logged rather than passed off as an empty workspace.
+    try:
+        return _cached_workspace_files(root)
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        logger.warning("Could not list workspace %s: %s", root, e)
+        return []
+
 
 async def get_agent_real_work_status(db: AsyncSession, agent_id: str, project_id: str) -> dict:
     """Fetch the ACTUAL work status of an agent from database activity logs.
@@ -204,9 +358,6 @@ async def get_agent_real_work_status(db: AsyncSession, agent_id: str, project_id
     Returns only verified, real data — no hallucination.  External agents can
     import this to gather context before generating responses.
     """
-    from teamwork.models import ActivityLog, Task
-    from pathlib import Path
-
     result: dict[str, Any] = {
         "has_any_activity": False,
         "current_task": None,
@@ -216,15 +367,32 @@ async def get_agent_real_work_status(db: AsyncSession, agent_id: str, project_id
         "summary": "No work has been done yet.",
     }
 
-    # Current assigned task
-    task_result = await db.execute(
-        select(Task)
+    # The workspace walk is blocking filesystem work that needs nothing from
+    # the task queries, so it runs in a worker thread while they execute.
+    workspace_path = await get_project_workspace_path(project_id, db)
+    listing = asyncio.create_task(_workspace_files(str(workspace_path)))
+
+    # Current assigned task (newest open one) and the five most recently
+    # completed, fetched together: one UNION ALL round-trip instead of two.
+    current_q = (
+        select(Task.title, Task.status, Task.description, Task.updated_at)
         .where(Task.assigned_to == agent_id)
         .where(Task.status.in_(["pending", "in_progress"]))
         .order_by(Task.created_at.desc())
         .limit(1)
     )
-    current_task = task_result.scalar_one_or_none()
+    completed_q = (
+        select(Task.title, Task.status, null().label("description"), Task.updated_at)
+        .where(Task.assigned_to == agent_id)
+        .where(Task.status == "completed")
+        .order_by(Task.updated_at.desc())
+        .limit(5)
+    )
+    task_rows = (
+        await db.execute(union_all(current_q.subquery().select(), completed_q.subquery().select()))
+    ).all()
+
+    current_task = next((t for t in task_rows if t.status != "completed"), None)
     if current_task:
         result["current_task"] = {
             "title": current_task.title,
@@ -232,15 +400,12 @@ async def get_agent_real_work_status(db: AsyncSession, agent_id: str, project_id
             "description": current_task.description,
         }
 
-    # Completed tasks
-    completed_result = await db.execute(
-        select(Task)
-        .where(Task.assigned_to == agent_id)
-        .where(Task.status == "completed")
-        .order_by(Task.updated_at.desc())
-        .limit(5)
+    # A UNION's row order is unspecified, so re-sort the completed side
+    completed_tasks = sorted(
+        (t for t in task_rows if t.status == "completed"),
+        key=lambda t: t.updated_at,
+        reverse=True,
     )
-    completed_tasks = completed_result.scalars().all()
     result["completed_tasks"] = [{"title": t.title, "status": t.status} for t in completed_tasks]
 
     # Recent activity logs
@@ -264,20 +429,7 @@ async def get_agent_real_work_status(db: AsyncSession, agent_id: str, project_id
             for a in activities
         ]
 
-    # Workspace files
-    from teamwork.utils.workspace import get_project_workspace_path
-    workspace_path = await get_project_workspace_path(project_id, db)
-    if workspace_path.exists():
-        try:
-            files = []
-            for f in workspace_path.rglob("*"):
-                if f.is_file() and not any(
-                    p in str(f) for p in [".git", "__pycache__", "node_modules", ".venv"]
-                ):
-                    files.append(str(f.relative_to(workspace_path)))
-            result["files_created"] = files[:20]
-        except Exception:
-            pass
+    result["files_created"] = await listing
 
     # Build summary from real data
     if result["has_any_activity"] or result["completed_tasks"] or result["files_created"]:
@@ -296,25 +448,54 @@ async def get_agent_real_work_status(db: AsyncSession, agent_id: str, project_id
             )
         result["summary"] = ". ".join(parts) if parts else "No significant work recorded."
     else:
-        result["summary"] = (
-            "No work has been done yet. No tasks completed, no files created, "
-            "no activities recorded."
-        )
+        result["summary"] = _NO_WORK_SUMMARY
 
     return result
 
 
 async def get_project_task_board(db: AsyncSession, project_id: str) -> dict:
     """Get the full task board status for a project — pure DB read."""
-    from teamwork.models import Task, Agent
-
+    # Only the columns the board reports. Full rows would carry every task's
+    # whole description (the board shows 100 characters) and every agent's
+    # prompts and profile image.
     tasks_result = await db.execute(
-        select(Task).where(Task.project_id == project_id).order_by(Task.created_at)
+        select(
+            Task.id,
+            Task.title,
+            func.substr(Task.description, 1, 100).label("description"),
+            Task.status,
+            Task.priority,
+            Task.team,
+            Task.assigned_to,
+            Task.blocked_by_json,
+        )
+        .where(Task.project_id == project_id)
+        .order_by(Task.created_at)
     )
-    all_tasks = tasks_result.scalars().all()
+    all_tasks = tasks_result.all()
+    blocked_by_of = {t.id: Task.parse_blocked_by(t.blocked_by_json) for t in all_tasks}
 
-    agents_result = await db.execute(select(Agent).where(Agent.project_id == project_id))
-    agents = {a.id: a for a in agents_result.scalars().all()}
+    agents_result = await db.execute(
+        select(Agent.id, Agent.name, Agent.role, Agent.status)
+        .where(Agent.project_id == project_id)
+    )
+    agents = {a.id: a for a in agents_result.all()}
+
+    # Resolve dependency status from the board itself; only blockers that
+    # live outside the project (if any) need a query, and they share one.
+    status_by_id = {t.id: t.status for t in all_tasks}
+    outside = {
+        b
+        for t in all_tasks
+        if t.status not in ("completed", "blocked", "in_progress")
+        for b in blocked_by_of[t.id]
+        if b not in status_by_id
+    }
+    if outside:
+        outside_rows = await db.execute(
+            select(Task.id, Task.status).where(Task.id.in_(outside))
+        )
+        status_by_id.update(outside_rows.tuples().all())
 
     todo_tasks, in_progress_tasks, blocked_tasks, completed_tasks = [], [], [], []
 
@@ -327,7 +508,7 @@ async def get_project_task_board(db: AsyncSession, project_id: str) -> dict:
         task_info = {
             "id": task.id,
             "title": task.title,
-            "description": (task.description or "")[:100],
+            "description": task.description or "",
             "assigned_to": assignee_name,
             "priority": task.priority,
             "team": task.team,
@@ -335,22 +516,17 @@ async def get_project_task_board(db: AsyncSession, project_id: str) -> dict:
         if task.status == "completed":
             completed_tasks.append(task_info)
         elif task.status == "blocked":
-            task_info["blocked_by"] = task.blocked_by
+            task_info["blocked_by"] = blocked_by_of[task.id]
             blocked_tasks.append(task_info)
         elif task.status == "in_progress":
             in_progress_tasks.append(task_info)
         else:
-            blocked_by = task.blocked_by or []
+            blocked_by = blocked_by_of[task.id]
             if blocked_by:
-                is_blocked = False
-                for blocker_id in blocked_by:
-                    blocker_result = await db.execute(
-                        select(Task).where(Task.id == blocker_id)
-                    )
-                    blocker = blocker_result.scalar_one_or_none()
-                    if blocker and blocker.status != "completed":
-                        is_blocked = True
-                        break
+                # A blocker that no longer exists doesn't block anything
+                is_blocked = any(
+                    status_by_id.get(b, "completed") != "completed" for b in blocked_by
+                )
                 if is_blocked:
                     task_info["blocked_by"] = blocked_by
                     blocked_tasks.append(task_info)
@@ -359,15 +535,32 @@ async def get_project_task_board(db: AsyncSession, project_id: str) -> dict:
             else:
                 todo_tasks.append(task_info)
 
+    # Per-agent tallies and current task in one pass over the board, so a
+    # caller summarising the team needn't look up each agent's task itself.
+    # "Current" matches get_agent_real_work_status: the newest open task,
+    # and the board is ordered oldest first, so the last one seen wins.
+    assigned_count: dict[str, int] = defaultdict(int)
+    completed_count: dict[str, int] = defaultdict(int)
+    current: dict[str, Any] = {}
+    for task in all_tasks:
+        if task.assigned_to is None:
+            continue
+        assigned_count[task.assigned_to] += 1
+        if task.status == "completed":
+            completed_count[task.assigned_to] += 1
+        elif task.status in ("pending", "in_progress"):
+            current[task.assigned_to] = task
+
     agent_statuses = []
     for agent in agents.values():
-        assigned = [t for t in all_tasks if t.assigned_to == agent.id]
+        task = current.get(agent.id)
         agent_statuses.append({
             "name": agent.name,
             "role": agent.role,
             "status": agent.status or "idle",
-            "assigned_tasks": len(assigned),
-            "completed_tasks": len([t for t in assigned if t.status == "completed"]),
+            "assigned_tasks": assigned_count[agent.id],
+            "completed_tasks": completed_count[agent.id],
+            "current_task": {"title": task.title, "status": task.status} if task else None,
         })
 
     return {
@@ -387,65 +580,116 @@ async def get_project_task_board(db: AsyncSession, project_id: str) -> dict:
 # ─── Slash commands (CRUD only — /memorize, /memories) ───────────────────────
 
 
+# Slash-command replies, built once at import instead of re-evaluating an
+# f-string per command; /memories joins its lines instead of growing a string.
+_MEMORIZED_TEMPLATE = (
+    "\u2713 **Memorized!** I'll remember: \"{instruction}\"\n\n"
+    "_This instruction will be included in all agent conversations. "
+    "Use `/memories` to see all stored instructions._"
+)
+_NO_MEMORIES_TEXT = (
+    "No memories stored yet.\n\n"
+    "Use `/memorize <instruction>` to add persistent instructions "
+    "that all agents will follow."
+)
+_MEMORIES_HEADER_TEMPLATE = "**Stored Memories ({count})**\n\n"
+_MEMORY_LINE_TEMPLATE = "{index}. {instruction}\n   _Added: {added_at}_\n\n"
+_MEMORIES_FOOTER_TEXT = "_Use `/memorize <instruction>` to add more._"
+
+
+def _append_memory_expr(entry: dict) -> Any:
+    """SQL expression appending *entry* to ``Project.config["memories"]``.
+
+    Evaluated inside the UPDATE, so two concurrent /memorize calls both land —
+    a read-modify-write in Python would let the later commit drop the earlier
+    memory. A NULL/non-object config or a missing/non-array ``memories`` key
+    starts from empty, matching what ``config.get("memories", [])`` did.
+    """
+    config = case(
+        (func.json_type(Project.config) == "object", Project.config), else_="{}"
+    )
+    memories = case(
+        (
+            func.json_type(Project.config, "$.memories") == "array",
+            func.json_extract(Project.config, "$.memories"),
+        ),
+        else_="[]",
+    )
+    return func.json_set(
+        config,
+        "$.memories",
+        func.json_insert(memories, "$[#]", func.json(json.dumps(entry))),
+    )
+
+
 async def handle_memorize_command(channel_id: str, project_id: str, instruction: str):
     """Store a persistent instruction in the project config."""
+    entry = {
+        "instruction": instruction,
+        "added_at": datetime.utcnow().isoformat(),
+        "channel_id": channel_id,
+    }
+    confirmation = _MEMORIZED_TEMPLATE.format(instruction=instruction)
     try:
+        # The memory and its confirmation are written in one transaction —
+        # one commit, and never a memory without its confirmation. The
+        # broadcast waits until the session has been released.
         async with AsyncSessionLocal() as db:
-            result = await db.execute(select(Project).where(Project.id == project_id))
-            project = result.scalar_one_or_none()
-            if not project:
+            result = await db.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                .values(config=_append_memory_expr(entry))
+            )
+            if result.rowcount == 0:
                 return
-
-            config = project.config or {}
-            memories = config.get("memories", [])
-            memories.append({
-                "instruction": instruction,
-                "added_at": datetime.utcnow().isoformat(),
-                "channel_id": channel_id,
-            })
-            config["memories"] = memories
-            project.config = config
+            message_id, created_at = await _insert_system_message(db, channel_id, confirmation)
             await db.commit()
 
-            await _post_system_message(
-                channel_id,
-                f"\u2713 **Memorized!** I'll remember: \"{instruction}\"\n\n"
-                "_This instruction will be included in all agent conversations. "
-                "Use `/memories` to see all stored instructions._",
-            )
-    except Exception as e:
-        logger.error("/memorize failed: %s", e)
+        await _broadcast_system_message(channel_id, message_id, confirmation, created_at)
+    except Exception:
+        logger.exception("/memorize failed channel=%s project=%s", channel_id, project_id)
 
 
 async def handle_memories_command(channel_id: str, project_id: str):
     """Display all stored memories for a project."""
     try:
         async with AsyncSessionLocal() as db:
-            result = await db.execute(select(Project).where(Project.id == project_id))
-            project = result.scalar_one_or_none()
-            if not project:
-                return
+            result = await db.execute(select(Project.config).where(Project.id == project_id))
+            row = result.first()
+        if row is None:
+            return
 
-            config = project.config or {}
-            memories = config.get("memories", [])
+        memories = (row.config or {}).get("memories", [])
+
+        if not memories:
+            content = _NO_MEMORIES_TEXT
+        else:
+            content = "".join([
+                _MEMORIES_HEADER_TEMPLATE.format(count=len(memories)),
+                *(
+                    _MEMORY_LINE_TEMPLATE.format(
+                        index=i,
+                        instruction=memory.get("instruction", ""),
+                        added_at=memory.get("added_at", "")[:10],
+                    )
+                    for i, memory in enumerate(memories, 1)
+                ),
+                _MEMORIES_FOOTER_TEXT,
+            ])
+
+        await _post_system_message(channel_id, content)
+    except Exception:
+        logger.exception("/memories failed channel=%s project=%s", channel_id, project_id)
 
-            if not memories:
-                content = (
-                    "No memories stored yet.\n\n"
-                    "Use `/memorize <instruction>` to add persistent instructions "
-                    "that all agents will follow."
-                )
-            else:
-                content = f"**Stored Memories ({len(memories)})**\n\n"
-                for i, memory in enumerate(memories, 1):
-                    instruction = memory.get("instruction", "")
-                    added_at = memory.get("added_at", "")[:10]
-                    content += f"{i}. {instruction}\n   _Added: {added_at}_\n\n"
-                content += "_Use `/memorize <instruction>` to add more._"
-
-            await _post_system_message(channel_id, content)
-    except Exception as e:
-        logger.error("/memories failed: %s", e)
+
+# Slash command → (handler, takes_argument). Keyed on the message's first
+# token, so dispatch is one dict lookup rather than a startswith() per command.
+# Handlers that take an argument receive the rest of the message and are
+# skipped when it is empty.
+_COMMANDS: dict[str, tuple[Any, bool]] = {
+    "/memorize": (handle_memorize_command, True),
+    "/memories": (handle_memories_command, False),
+}
 
 
 # ─── Route handlers ──────────────────────────────────────────────────────────
@@ -524,7 +768,6 @@ async def search_messages(
         # FTS5 not available — fall back to LIKE
         logger.info("FTS5 not available, falling back to LIKE search")
         pattern = f"%{q}%"
-        from sqlalchemy import func
 
         base_filter = (
             select(Message)
@@ -539,16 +782,20 @@ async def search_messages(
         msgs = result.scalars().all()
         rows = [(m.id, m.channel_id, m.agent_id, m.content, m.created_at) for m in msgs]
 
+    # Resolve every sender on the page in one query rather than one per hit
+    agent_ids = {row[2] for row in rows if row[2]}
+    agent_names: dict[str, str] = {}
+    if agent_ids:
+        name_rows = await db.execute(
+            select(Agent.id, Agent.name).where(Agent.id.in_(agent_ids))
+        )
+        agent_names = dict(name_rows.tuples().all())
+
     # Build response
     hits = []
     for row in rows:
         msg_id, channel_id, agent_id, content, created_at = row
-        agent_name = None
-        if agent_id:
-            ag = await db.execute(select(Agent.name).where(Agent.id == agent_id))
-            ag_row = ag.first()
-            if ag_row:
-                agent_name = ag_row[0]
+        agent_name = agent_names.get(agent_id) if agent_id else None
 
         created_str = created_at.isoformat() if hasattr(created_at, 'isoformat') else str(created_at)
         hits.append(SearchResult(
@@ -572,24 +819,28 @@ async def list_channel_messages(
     thread_id: str | None = None,
 ) -> MessageListResponse:
     """List messages in a channel."""
-    channel_result = await db.execute(select(Channel).where(Channel.id == channel_id))
-    channel = channel_result.scalar_one_or_none()
-    if not channel:
+    channel_result = await db.execute(
+        select(literal(1)).where(Channel.id == channel_id).limit(1)
+    )
+    if channel_result.first() is None:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    query = select(Message).where(Message.channel_id == channel_id)
-    if thread_id:
-        query = query.where(Message.thread_id == thread_id)
-    else:
-        query = query.where(Message.thread_id.is_(None))
+    in_view = (
+        Message.channel_id == channel_id,
+        Message.thread_id == thread_id if thread_id else Message.thread_id.is_(None),
+    )
 
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
+    # Count in the database; loading the whole channel just to len() it
+    # made every page cost as much as the channel's entire history.
+    total = await db.scalar(select(func.count()).select_from(Message).where(*in_view))
 
     result = await db.execute(
-        query.order_by(Message.created_at.desc()).offset(skip).limit(limit + 1)
+        message_rows(*in_view)
+        .order_by(Message.created_at.desc())
+        .offset(skip)
+        .limit(limit + 1)
     )
-    messages = list(result.scalars().all())
+    messages = list(result.all())
 
     has_more = len(messages) > limit
     if has_more:
@@ -597,7 +848,7 @@ async def list_channel_messages(
     messages.reverse()
 
     return MessageListResponse(
-        messages=[await message_to_response(m, db) for m in messages],
+        messages=await messages_to_responses(messages, db),
         total=total,
         has_more=has_more,
     )
@@ -615,105 +866,130 @@ async def create_message(
     agent's webhook.  The external agent responds by posting back via the
     external API.  No AI generation happens here.
     """
-    # Verify channel
-    channel_result = await db.execute(select(Channel).where(Channel.id == message.channel_id))
-    channel = channel_result.scalar_one_or_none()
-    if not channel:
+    # Verify channel, and fetch its project's config in the same round-trip.
+    # Only the columns used below are selected — hydrating full ORM instances
+    # to read two attributes is wasted work on every post.
+    channel_row = (
+        await db.execute(
+            select(Channel.project_id, Project.config)
+            .join(Project, Project.id == Channel.project_id)
+            .where(Channel.id == message.channel_id)
+        )
+    ).first()
+    if channel_row is None:
         raise HTTPException(status_code=404, detail="Channel not found")
+    project_id, project_config = channel_row
 
     # Verify agent
-    agent_name = "User"
+    agent_name, agent_role = None, None
     if message.agent_id:
-        agent_result = await db.execute(select(Agent).where(Agent.id == message.agent_id))
-        agent = agent_result.scalar_one_or_none()
-        if not agent:
+        agent_row = (
+            await db.execute(
+                select(Agent.name, Agent.role).where(Agent.id == message.agent_id)
+            )
+        ).first()
+        if agent_row is None:
             raise HTTPException(status_code=404, detail="Agent not found")
-        agent_name = agent.name
+        agent_name, agent_role = agent_row
 
     # Verify thread
     if message.thread_id:
         thread_result = await db.execute(
-            select(Message).where(Message.id == message.thread_id)
+            select(literal(1)).where(Message.id == message.thread_id).limit(1)
         )
-        if not thread_result.scalar_one_or_none():
+        if thread_result.first() is None:
             raise HTTPException(status_code=404, detail="Thread not found")
 
-    # Persist
-    db_message = Message(
+    # Persist. The INSERT returns the generated id and timestamp itself, so
+    # there is no flush/refresh round-trip and no ORM instance to hydrate.
+    message_id, created_at = (
+        await db.execute(
+            insert(Message)
+            .values(
+                channel_id=message.channel_id,
+                agent_id=message.agent_id,
+                content=message.content,
+                message_type=message.message_type,
+                extra_data=message.extra_data,
+                thread_id=message.thread_id,
+            )
+            .returning(Message.id, Message.created_at)
+        )
+    ).one()
+    await db.commit()
+
+    # A message that was just created has no replies, and its sender was
+    # resolved above — nothing left to look up.
+    response = MessageResponse(
+        id=message_id,
         channel_id=message.channel_id,
         agent_id=message.agent_id,
+        agent_name=agent_name,
+        agent_role=agent_role,
         content=message.content,
         message_type=message.message_type,
         extra_data=message.extra_data,
         thread_id=message.thread_id,
+        reply_count=0,
+        created_at=created_at.isoformat(),
+        updated_at=None,
     )
-    db.add(db_message)
-    await db.flush()
-    await db.refresh(db_message)
-    await db.commit()
-
-    response = await message_to_response(db_message, db)
 
-    # Broadcast
-    await manager.broadcast_to_channel(
+    # Broadcast after the response is sent: the message is already committed,
+    # so the poster needn't wait on every subscriber's socket.  Background
+    # tasks run in the order added, so the broadcast still precedes any
+    # system message a slash command posts below.
+    background_tasks.add_task(
+        manager.broadcast_to_channel,
         message.channel_id,
         WebSocketEvent(
             type=EventType.MESSAGE_NEW,
             data={
-                "id": db_message.id,
-                "channel_id": db_message.channel_id,
-                "agent_id": db_message.agent_id,
-                "agent_name": agent_name,
-                "content": db_message.content,
-                "message_type": db_message.message_type,
-                "extra_data": db_message.extra_data,
-                "thread_id": db_message.thread_id,
-                "created_at": db_message.created_at.isoformat(),
+                "id": message_id,
+                "channel_id": message.channel_id,
+                "agent_id": message.agent_id,
+                "agent_name": agent_name or "User",
+                **broadcast_content(message.content),
+                "message_type": message.message_type,
+                "extra_data": message.extra_data,
+                "thread_id": message.thread_id,
+                "created_at": created_at,
             },
         ),
     )
+    if message.agent_id is not None:
+        return response
 
     # Handle user messages (not from an agent)
-    if message.agent_id is None:
-        project_result = await db.execute(
-            select(Project).where(Project.id == channel.project_id)
-        )
-        project = project_result.scalar_one_or_none()
-
-        # External mode → forward to webhook
-        if project and (project.config or {}).get("project_type") == "external":
-            webhook_url = (project.config or {}).get("webhook_url")
-            if webhook_url:
-                background_tasks.add_task(
-                    _forward_to_external_webhook,
-                    webhook_url,
-                    project.id,
-                    message.channel_id,
-                    message.content,
-                    db_message.id,
-                    message.active_view,
-                    message.extra_data,
-                    message.space_slug,
-                )
+    project_config = project_config or {}
 
-        # Handle CRUD-only slash commands
-        content_lower = message.content.strip().lower()
-        if content_lower.startswith("/memorize "):
-            instruction = message.content.strip()[10:].strip()
-            if instruction:
-                background_tasks.add_task(
-                    handle_memorize_command,
-                    message.channel_id,
-                    channel.project_id,
-                    instruction,
-                )
-        elif content_lower.startswith("/memories"):
+    # External mode → forward to webhook
+    if project_config.get("project_type") == "external":
+        webhook_url = project_config.get("webhook_url")
+        if webhook_url:
             background_tasks.add_task(
-                handle_memories_command,
+                _forward_to_external_webhook,
+                webhook_url,
+                project_id,
                 message.channel_id,
-                channel.project_id,
+                message.content,
+                message_id,
+                message.active_view,
+                message.extra_data,
+                message.space_slug,
             )
 
+    # Handle CRUD-only slash commands
+    head, _, rest = message.content.strip().partition(" ")
+    command = _COMMANDS.get(head.lower())
+    if command:
+        handler, takes_argument = command
+        rest = rest.strip()
+        if not takes_argument:
+            background_tasks.add_task(handler, message.channel_id, project_id)
+        elif rest:
+            background_tasks.add_task(handler, message.channel_id, project_id, rest)
+
     return response
 
 
@@ -723,11 +999,10 @@ async def get_message(
     db: AsyncSession = Depends(get_db),
 ) -> MessageResponse:
     """Get a message by ID."""
-    result = await db.execute(select(Message).where(Message.id == message_id))
-    message = result.scalar_one_or_none()
-    if not message:
+    row = (await db.execute(message_rows(Message.id == message_id))).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Message not found")
-    return await message_to_response(message, db)
+    return (await messages_to_responses([row], db))[0]
 
 
 @router.get("/{message_id}/thread", response_model=MessageListResponse)
@@ -738,29 +1013,36 @@ async def get_thread_replies(
     limit: int = 50,
 ) -> MessageListResponse:
     """Get replies in a thread."""
-    parent_result = await db.execute(select(Message).where(Message.id == message_id))
-    if not parent_result.scalar_one_or_none():
+    # Parent existence and reply count in one round-trip; the count is done by
+    # the database rather than by loading every reply to len() them.
+    parent_exists, total = (
+        await db.execute(
+            select(
+                exists().where(Message.id == message_id),
+                select(func.count())
+                .select_from(Message)
+                .where(Message.thread_id == message_id)
+                .scalar_subquery(),
+            )
+        )
+    ).one()
+    if not parent_exists:
         raise HTTPException(status_code=404, detail="Message not found")
 
-    query = select(Message).where(Message.thread_id == message_id)
-
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
-
     result = await db.execute(
-        query.order_by(Message.created_at).offset(skip).limit(limit + 1)
+        message_rows(Message.thread_id == message_id)
+        .order_by(Message.created_at)
+        .offset(skip)
+        .limit(limit + 1)
     )
-    messages = list(result.scalars().all())
+    messages = list(result.all())
 
     has_more = len(messages) > limit
     if has_more:
         messages = messages[:limit]
 
     return MessageListResponse(
-        messages=[
-            await message_to_response(m, db, include_reply_count=False)
-            for m in messages
-        ],
+        messages=await messages_to_responses(messages, db, include_reply_count=False),
         total=total,
         has_more=has_more,
     )
@@ -771,12 +1053,21 @@ async def delete_message(
     message_id: str,
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    """Delete a message."""
-    result = await db.execute(select(Message).where(Message.id == message_id))
-    message = result.scalar_one_or_none()
-    if not message:
+    """Delete a message.
+
+    One DELETE ... RETURNING both removes the row and tells us whether it
+    existed, instead of loading the entity first. Replies to a deleted thread
+    parent are kept as top-level messages — what the ORM delete did by
+    nulling ``thread_id`` through the ``parent_message`` backref.
+    """
+    await db.execute(
+        update(Message).where(Message.thread_id == message_id).values(thread_id=None)
+    )
+    result = await db.execute(
+        delete(Message).where(Message.id == message_id).returning(Message.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Message not found")
-    await db.delete(message)
     await db.commit()
 
 
@@ -793,8 +1084,7 @@ async def toggle_reaction(
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Toggle a reaction on a message. Returns updated reactions dict."""
-    result = await db.execute(select(Message).where(Message.id == message_id))
-    message = result.scalar_one_or_none()
+    message = await db.get(Message, message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
 
@@ -854,27 +1144,23 @@ async def message_stats(
     db: AsyncSession = Depends(get_db),
 ) -> MessageStatsResponse:
     """Get message count breakdown by age for a project."""
-    # Get all channel IDs in this project.
-    ch_result = await db.execute(
-        select(Channel.id).where(Channel.project_id == project_id)
-    )
-    channel_ids = [r[0] for r in ch_result.fetchall()]
-    if not channel_ids:
-        return MessageStatsResponse(
-            total=0, last_7_days=0, last_30_days=0,
-            last_90_days=0, older_than_90_days=0,
-        )
-
     now = datetime.utcnow()
-    d7 = now - timedelta(days=7)
-    d30 = now - timedelta(days=30)
-    d90 = now - timedelta(days=90)
-
-    base = select(func.count(Message.id)).where(Message.channel_id.in_(channel_ids))
-    total = (await db.execute(base)).scalar() or 0
-    last_7 = (await db.execute(base.where(Message.created_at >= d7))).scalar() or 0
-    last_30 = (await db.execute(base.where(Message.created_at >= d30))).scalar() or 0
-    last_90 = (await db.execute(base.where(Message.created_at >= d90))).scalar() or 0
+
+    def newer_than(days: int):
+        # COUNT skips NULLs, so this counts only the rows inside the window.
+        return func.count(case((Message.created_at >= now - timedelta(days=days), 1)))
+
+    # Every bucket in one scan of the project's messages, rather than a
+    # channel lookup followed by four separate COUNT queries.
+    total, last_7, last_30, last_90 = (
+        await db.execute(
+            select(func.count(), newer_than(7), newer_than(30), newer_than(90)).where(
+                Message.channel_id.in_(
+                    select(Channel.id).where(Channel.project_id == project_id)
+                )
+            )
+        )
+    ).one()
     older = total - last_90
 
     # Try to get DB file size.
@@ -882,7 +1168,6 @@ async def message_stats(
     try:
         db_url = settings.database_url
         if "sqlite" in db_url and ":memory:" not in db_url:
-            import os
             prefix_end = db_url.find(":///") + 4
             db_path = db_url[prefix_end:]
             if os.path.exists(db_path):
@@ -1009,10 +1294,10 @@ async def compactify_old_messages(
 
     # Get channels in this project.
     ch_result = await db.execute(
-        select(Channel).where(Channel.project_id == request.project_id)
+        select(Channel.id).where(Channel.project_id == request.project_id)
     )
-    channels = ch_result.scalars().all()
-    if not channels:
+    channel_ids = ch_result.scalars().all()
+    if not channel_ids:
         return CompactifyResponse(
             channels_processed=0, messages_removed=0,
             summaries_created=0, message="No channels found",
@@ -1023,14 +1308,15 @@ async def compactify_old_messages(
     channels_processed = 0
     chunk_size = 50  # Messages per summary chunk.
 
-    for channel in channels:
-        # Get old messages for this channel, ordered by time.
+    for channel_id in channel_ids:
+        # Get old messages for this channel, ordered by time — only the
+        # columns the summary transcript and the delete use, not full rows.
         msg_result = await db.execute(
-            select(Message)
-            .where(Message.channel_id == channel.id, Message.created_at < cutoff)
+            select(Message.id, Message.agent_id, Message.content, Message.created_at)
+            .where(Message.channel_id == channel_id, Message.created_at < cutoff)
             .order_by(Message.created_at.asc())
         )
-        old_messages = msg_result.scalars().all()
+        old_messages = msg_result.all()
         if not old_messages:
             continue
 
@@ -1052,7 +1338,7 @@ async def compactify_old_messages(
             earliest = chunk[0].created_at
             summary_msg = Message(
                 id=str(uuid.uuid4()),
-                channel_id=channel.id,
+                channel_id=channel_id,
                 agent_id=None,
                 content=f"**[Summary of {len(chunk)} messages]**\n\n{summary}",
                 message_type="system",
@@ -1088,7 +1374,7 @@ async def compactify_old_messages(
     )
 
 
-def _format_chunk_for_summary(messages: list[Message]) -> str:
+def _format_chunk_for_summary(messages: Sequence[Row]) -> str:
     """Format a chunk of messages into text for the LLM."""
     lines = []
     for m in messages:
@@ -1098,6 +1384,32 @@ def _format_chunk_for_summary(messages: list[Message]) -> str:
     return "\n".join(lines)
 
 
+# Identical on every call and placed first, so a provider that caches prompt
+# prefixes (OpenAI does so automatically) can reuse it across the chunks of a
+# compaction run; only the transcript that follows varies.
+_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "You are summarizing old chat messages from a project workspace. "
+        "Write a concise summary that preserves key decisions, action items, "
+        "important information, and outcomes. Skip pleasantries and routine "
+        "status updates. Use bullet points. Be brief."
+    ),
+}
+
+
+_MAX_RETRY_AFTER = 30.0
+
+
+def _retry_after_seconds(resp: httpx.Response) -> float:
+    """How long a 429 asks us to wait: Retry-After in seconds, capped."""
+    try:
+        wait = float(resp.headers.get("Retry-After", 1))
+    except ValueError:  # the HTTP-date form; not worth parsing here
+        wait = 1.0
+    return min(max(wait, 0.0), _MAX_RETRY_AFTER)
+
+
 async def _llm_summarize(
     text: str,
     api_key: str,
@@ -1111,9 +1423,10 @@ async def _llm_summarize(
     Together, or any service exposing an OpenAI-compatible chat endpoint.
     Uses httpx directly — no SDK dependency.
     """
+    prompt = f"Summarize this conversation:\n\n{text[:12000]}"
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.post(
+        for attempt in range(2):
+            resp = await get_http_client().post(
                 api_base_url,
                 headers={
                     "Authorization": f"Bearer {api_key}",
@@ -1122,27 +1435,23 @@ async def _llm_summarize(
                 json={
                     "model": model,
                     "messages": [
-                        {
-                            "role": "system",
-                            "content": (
-                                "You are summarizing old chat messages from a project workspace. "
-                                "Write a concise summary that preserves key decisions, action items, "
-                                "important information, and outcomes. Skip pleasantries and routine "
-                                "status updates. Use bullet points. Be brief."
-                            ),
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Summarize this conversation:\n\n{text[:12000]}",
-                        },
+                        _SUMMARY_SYSTEM_MESSAGE,
+                        {"role": "user", "content": prompt},
                     ],
                     "max_tokens": 500,
                     "temperature": 0.3,
                 },
+                timeout=60,
             )
-            resp.raise_for_status()
-            data = resp.json()
-            return data["choices"][0]["message"]["content"].strip()
+            if resp.status_code != 429 or attempt:
+                break
+            # Rate limited. Compactify sends its chunks back to back, so
+            # moving straight on would only earn the next chunk a 429 too.
+            # Wait as long as the provider asks (within reason), then retry.
+            await asyncio.sleep(_retry_after_seconds(resp))
+        resp.raise_for_status()
+        data = resp.json()
+        return data["choices"][0]["message"]["content"].strip()
     except Exception as e:
         logger.warning("LLM summarization failed: %s", e)
         return None
@@ -5,10 +5,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Body, HTTPException
 
 from teamwork.config import settings
+from teamwork.utils.http import get_http_client
 
 router = APIRouter(prefix="/prax", tags=["prax"])
 _logger = logging.getLogger(__name__)
@@ -22,14 +22,14 @@ async def _proxy(method: str, path: str, **kwargs: Any) -> Any:
     if not prax_url:
         return None
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.request(
-                method,
-                f"{prax_url.rstrip('/')}{_PRAX_BASE}{path}",
-                **kwargs,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await get_http_client().request(
+            method,
+            f"{prax_url.rstrip('/')}{_PRAX_BASE}{path}",
+            **kwargs,
+            timeout=15.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
     except Exception as exc:
         _logger.debug("Failed to proxy %s %s to Prax: %s", method, path, exc)
         return None
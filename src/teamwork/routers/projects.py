@@ -1,15 +1,18 @@
 """Projects API router."""
 
+import logging
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from teamwork.models import Channel, Project, Task, Agent, get_db
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
@@ -55,8 +58,7 @@ async def list_projects(
     )
     projects = result.scalars().all()
 
-    count_result = await db.execute(select(Project))
-    total = len(count_result.scalars().all())
+    total = await db.scalar(select(func.count()).select_from(Project))
 
     return ProjectListResponse(
         projects=[
@@ -88,7 +90,6 @@ async def create_project(
     )
     db.add(db_project)
     await db.flush()
-    await db.refresh(db_project)
 
     return ProjectResponse(
         id=db_project.id,
@@ -140,14 +141,57 @@ async def create_blank_workspace(
     }
 
 
+def project_to_response(project: Project) -> ProjectResponse:
+    """Convert a Project model to a response."""
+    return ProjectResponse(
+        id=project.id,
+        name=project.name,
+        description=project.description,
+        config=project.config,
+        status=project.status,
+        created_at=project.created_at.isoformat(),
+        updated_at=project.updated_at.isoformat(),
+    )
+
+
+async def _project_config(db: AsyncSession, project_id: str) -> dict:
+    """The project's config (a fresh dict), or 404 if there is no such project."""
+    row = (await db.execute(select(Project.config).where(Project.id == project_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return dict(row.config or {})
+
+
+async def _update_project(db: AsyncSession, project_id: str, **values) -> Project:
+    """Write ``values`` to the project in one UPDATE ... RETURNING.
+
+    Config changes are always written as a new dict: JSON columns don't track
+    in-place mutation, so editing the loaded dict and assigning it back was
+    silently never saved. With nothing to change there is no UPDATE, so
+    ``updated_at`` only moves when something did.
+    """
+    if not values:
+        project = await db.get(Project, project_id)
+        if project is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return project
+    return (
+        await db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(updated_at=datetime.utcnow(), **values)
+            .returning(Project)
+        )
+    ).scalar_one()
+
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: str,
     db: AsyncSession = Depends(get_db),
 ) -> ProjectResponse:
     """Get a project by ID."""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+    project = await db.get(Project, project_id)
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -180,38 +224,22 @@ class ProjectConfigUpdate(BaseModel):
 @router.patch("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: str,
-    update: ProjectUpdate,
+    changes: ProjectUpdate,
     db: AsyncSession = Depends(get_db),
 ) -> ProjectResponse:
     """Update a project."""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    if update.name is not None:
-        project.name = update.name
-    if update.description is not None:
-        project.description = update.description
-    if update.config is not None:
+    config = await _project_config(db, project_id)
+
+    values: dict = {}
+    if changes.name is not None:
+        values["name"] = changes.name
+    if changes.description is not None:
+        values["description"] = changes.description
+    if changes.config is not None:
         # Merge config instead of replace
-        existing_config = project.config or {}
-        existing_config.update(update.config)
-        project.config = existing_config
-
-    await db.flush()
-    await db.refresh(project)
+        values["config"] = {**config, **changes.config}
 
-    return ProjectResponse(
-        id=project.id,
-        name=project.name,
-        description=project.description,
-        config=project.config,
-        status=project.status,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat(),
-    )
+    return project_to_response(await _update_project(db, project_id, **values))
 
 
 @router.patch("/{project_id}/config", response_model=ProjectResponse)
@@ -221,15 +249,8 @@ async def update_project_config(
     db: AsyncSession = Depends(get_db),
 ) -> ProjectResponse:
     """Update specific project configuration values."""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    config = await _project_config(db, project_id)
 
-    # Get existing config or create new
-    config = project.config or {}
-    
     # Update only provided values
     if config_update.auto_execute_tasks is not None:
         config["auto_execute_tasks"] = config_update.auto_execute_tasks
@@ -237,20 +258,8 @@ async def update_project_config(
         config["runtime_mode"] = config_update.runtime_mode
     if config_update.workspace_type is not None:
         config["workspace_type"] = config_update.workspace_type
-    
-    project.config = config
-    await db.flush()
-    await db.refresh(project)
 
-    return ProjectResponse(
-        id=project.id,
-        name=project.name,
-        description=project.description,
-        config=project.config,
-        status=project.status,
-        created_at=project.created_at.isoformat(),
-        updated_at=project.updated_at.isoformat(),
-    )
+    return project_to_response(await _update_project(db, project_id, config=config))
 
 
 class PauseResumeResponse(BaseModel):
@@ -270,35 +279,26 @@ async def pause_project(
     Pause a project - stops all running agents immediately.
     Tasks in progress will be saved and can be resumed later.
     """
-    from teamwork.models import Agent
-    
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    # Get all agents for this project
-    agents_result = await db.execute(select(Agent).where(Agent.project_id == project_id))
-    agents = agents_result.scalars().all()
-    
+    config = await _project_config(db, project_id)
+
     # Mark all agents as paused
-    for agent in agents:
-        agent.status = "paused"
-    
+    agents_paused = (
+        await db.execute(
+            update(Agent).where(Agent.project_id == project_id).values(status="paused")
+        )
+    ).rowcount
+
     # Update project status and config
-    project.status = "paused"
-    config = project.config or {}
     config["paused"] = True
     config["paused_at"] = datetime.utcnow().isoformat()
-    project.config = config
-    
+    await _update_project(db, project_id, status="paused", config=config)
+
     await db.commit()
-    
+
     return PauseResumeResponse(
         success=True,
         status="paused",
-        agents_affected=len(agents),
+        agents_affected=agents_paused,
         message="Project paused. All agents marked as paused.",
     )
 
@@ -312,43 +312,31 @@ async def resume_project(
     Resume a paused project - agents can start working again.
     Does not automatically restart tasks, but allows new tasks to execute.
     """
-    from teamwork.models import Agent, Task
-    
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    # Get all agents for this project
-    agents_result = await db.execute(select(Agent).where(Agent.project_id == project_id))
-    agents = agents_result.scalars().all()
-    
+    config = await _project_config(db, project_id)
+
     # Reset agent status from paused to idle
-    agents_resumed = 0
-    for agent in agents:
-        if agent.status == "paused":
-            agent.status = "idle"
-            agents_resumed += 1
-    
+    agents_resumed = (
+        await db.execute(
+            update(Agent)
+            .where(Agent.project_id == project_id, Agent.status == "paused")
+            .values(status="idle")
+        )
+    ).rowcount
+
     # Update project status
-    project.status = "active"
-    config = project.config or {}
     config["paused"] = False
-    if "paused_at" in config:
-        del config["paused_at"]
-    project.config = config
-    
+    config.pop("paused_at", None)
+    await _update_project(db, project_id, status="active", config=config)
+
     await db.commit()
     
     # Count in-progress tasks that can be resumed
-    tasks_result = await db.execute(
-        select(Task).where(
+    pending_tasks = await db.scalar(
+        select(func.count()).select_from(Task).where(
             Task.project_id == project_id,
             Task.status == "in_progress"
         )
     )
-    pending_tasks = len(tasks_result.scalars().all())
     
     message = f"Project resumed. {agents_resumed} agent(s) ready to work."
     if pending_tasks > 0:
@@ -384,8 +372,7 @@ async def delete_project(
     from teamwork.models import Agent
     from teamwork.models.activity import ActivityLog
     
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+    project = await db.get(Project, project_id)
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -420,14 +407,10 @@ async def delete_project(
         except Exception:
             pass
     
-    # 3. Delete activity logs for these agents
+    # 3. Delete activity logs for these agents — one DELETE, not a load and
+    #    a delete per row.
     if agent_ids:
-        activities_result = await db.execute(
-            select(ActivityLog).where(ActivityLog.agent_id.in_(agent_ids))
-        )
-        activities = activities_result.scalars().all()
-        for activity in activities:
-            await db.delete(activity)
+        await db.execute(delete(ActivityLog).where(ActivityLog.agent_id.in_(agent_ids)))
     
     # 4. Delete workspace directory
     if project.workspace_dir:
@@ -436,7 +419,7 @@ async def delete_project(
             try:
                 shutil.rmtree(workspace_path)
             except Exception as e:
-                print(f"Warning: Could not delete workspace {workspace_path}: {e}")
+                logger.warning("Could not delete workspace %s: %s", workspace_path, e)
     
     # 5. Delete the project (cascades to agents, channels, tasks, messages)
     await db.delete(project)
@@ -479,8 +462,7 @@ async def reset_project(
     from pathlib import Path
     from teamwork.config import settings
     
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
+    project = await db.get(Project, project_id)
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -518,62 +500,54 @@ async def reset_project(
             pass
     
     if containers_stopped > 0:
-        print(f">>> Reset: Stopped {containers_stopped} Docker containers", flush=True)
+        logger.info("Reset: stopped %d Docker containers", containers_stopped)
     
+    # The database side of the reset is four set-based statements. Loading
+    # every task, activity and message only to modify or delete it one row at
+    # a time cost a round-trip per row — thousands for a busy project.
+
     # Reset ALL tasks to pending (regardless of current status)
-    tasks_result = await db.execute(select(Task).where(Task.project_id == project_id))
-    tasks = tasks_result.scalars().all()
-    tasks_reset = 0
-    for task in tasks:
-        old_status = task.status
-        task.status = "pending"
-        task.assigned_to = None
-        task.retry_count = 0
-        task.last_error = None
-        task.start_commit = None
-        task.end_commit = None
-        tasks_reset += 1
-        print(f">>> Reset task: '{task.title}' {old_status} -> pending", flush=True)
-    
+    tasks_reset = (
+        await db.execute(
+            update(Task)
+            .where(Task.project_id == project_id)
+            .values(
+                status="pending", assigned_to=None, retry_count=0,
+                last_error=None, start_commit=None, end_commit=None,
+            )
+        )
+    ).rowcount
+
     # Clear activity logs for these agents
     activities_cleared = 0
     if agent_ids:
-        activities_result = await db.execute(
-            select(ActivityLog).where(ActivityLog.agent_id.in_(agent_ids))
-        )
-        activities = activities_result.scalars().all()
-        activities_cleared = len(activities)
-        for activity in activities:
-            await db.delete(activity)
-    
+        activities_cleared = (
+            await db.execute(delete(ActivityLog).where(ActivityLog.agent_id.in_(agent_ids)))
+        ).rowcount
+
     # Clear all messages in all channels
-    channels_result = await db.execute(select(Channel).where(Channel.project_id == project_id))
-    channels = channels_result.scalars().all()
-    print(f">>> Reset: Found {len(channels)} channels to clear", flush=True)
-    messages_cleared = 0
-    for channel in channels:
-        messages_result = await db.execute(select(Message).where(Message.channel_id == channel.id))
-        messages = messages_result.scalars().all()
-        print(f">>> Reset: Channel '{channel.name}' has {len(messages)} messages to delete", flush=True)
-        messages_cleared += len(messages)
-        for message in messages:
-            await db.delete(message)
-    print(f">>> Reset: Deleted {messages_cleared} messages total", flush=True)
-    
+    messages_cleared = (
+        await db.execute(
+            delete(Message).where(
+                Message.channel_id.in_(select(Channel.id).where(Channel.project_id == project_id))
+            )
+        )
+    ).rowcount
+    logger.debug("Reset: deleted %d messages total", messages_cleared)
+
     # Reset agent status
-    for agent in agents:
-        agent.status = "idle"
+    await db.execute(update(Agent).where(Agent.project_id == project_id).values(status="idle"))
     
     # Clear workspace directory (use project.workspace_dir, not config)
     workspace_dir_name = project.workspace_dir or project.get_workspace_dir_name()
     files_deleted = 0
     if workspace_dir_name:
         workspace_path = settings.workspace_path / workspace_dir_name
-        print(f">>> Reset: Looking for workspace at {workspace_path}", flush=True)
+        logger.debug("Reset: looking for workspace at %s", workspace_path)
         if workspace_path.exists() and workspace_path.is_dir():
-            print(f">>> Reset: Clearing workspace {workspace_path}", flush=True)
+            logger.info("Reset: clearing workspace %s", workspace_path)
             items_to_delete = [item for item in workspace_path.iterdir() if item.name not in [".git"]]
-            print(f">>> Reset: Found {len(items_to_delete)} items to delete (excluding .git)", flush=True)
+            logger.debug("Reset: found %d items to delete (excluding .git)", len(items_to_delete))
             
             # First try: use Python's shutil (works for files we own)
             for item in items_to_delete:
@@ -583,16 +557,16 @@ async def reset_project(
                     else:
                         item.unlink()
                     files_deleted += 1
-                    print(f">>> Reset: Deleted {item.name}", flush=True)
+                    logger.debug("Reset: deleted %s", item.name)
                 except PermissionError as e:
-                    print(f">>> Reset: Permission denied for {item.name}, will try Docker cleanup", flush=True)
+                    logger.info("Reset: permission denied for %s, will try Docker cleanup", item.name)
                 except Exception as e:
-                    print(f">>> Reset: Could not delete {item}: {e}", flush=True)
+                    logger.warning("Reset: could not delete %s: %s", item, e)
             
             # Second try: if files remain, use Docker to clean (handles root-owned files)
             remaining = [item for item in workspace_path.iterdir() if item.name not in [".git"]]
             if remaining:
-                print(f">>> Reset: {len(remaining)} items remain, using Docker to clean root-owned files", flush=True)
+                logger.info("Reset: %d items remain, using Docker to clean root-owned files", len(remaining))
                 try:
                     # Use a minimal Docker container to rm -rf the workspace contents
                     # Mount the workspace and delete everything except .git
@@ -607,26 +581,29 @@ async def reset_project(
                     if result_clean.returncode == 0:
                         remaining_after = [item for item in workspace_path.iterdir() if item.name not in [".git"]]
                         cleaned = len(remaining) - len(remaining_after)
-                        print(f">>> Reset: Docker cleaned {cleaned} more items", flush=True)
+                        logger.info("Reset: Docker cleaned %d more items", cleaned)
                         files_deleted += cleaned
                     else:
-                        print(f">>> Reset: Docker clean failed: {result_clean.stderr.decode()}", flush=True)
+                        logger.warning("Reset: Docker clean failed: %s", result_clean.stderr.decode())
                 except Exception as e:
-                    print(f">>> Reset: Docker cleanup failed: {e}", flush=True)
+                    logger.warning("Reset: Docker cleanup failed: %s", e)
         else:
-            print(f">>> Reset: Workspace path does not exist: {workspace_path}", flush=True)
+            logger.debug("Reset: workspace path does not exist: %s", workspace_path)
     else:
-        print(">>> Reset: No workspace_dir found for project", flush=True)
+        logger.debug("Reset: no workspace_dir found for project")
     
     # Make sure project is not paused so tasks can be picked up
     project.status = "active"
     if project.config:
         project.config = {**project.config, "paused": False}
-    print(">>> Reset: Project status set to active", flush=True)
+    logger.debug("Reset: project status set to active")
     
     await db.commit()
     
-    print(f">>> Reset complete: {tasks_reset} tasks, {messages_cleared} messages, {activities_cleared} activities, {files_deleted} files cleared", flush=True)
+    logger.info(
+        "Reset complete: %d tasks, %d messages, %d activities, %d files cleared",
+        tasks_reset, messages_cleared, activities_cleared, files_deleted,
+    )
     
     return ResetResponse(
         success=True,
@@ -4,10 +4,10 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from teamwork.models import Task, Project, Agent, get_db
+from teamwork.models import ActivityLog, Task, Project, Agent, get_db
 from teamwork.websocket import manager, WebSocketEvent, EventType
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -69,57 +69,67 @@ class TaskListResponse(BaseModel):
     total: int
 
 
-async def task_to_response(task: Task, db: AsyncSession) -> TaskResponse:
-    """Convert Task model to response schema."""
-    assigned_agent_name = None
-    if task.assigned_to:
-        agent_result = await db.execute(
-            select(Agent).where(Agent.id == task.assigned_to)
+async def tasks_to_responses(tasks: list[Task], db: AsyncSession) -> list[TaskResponse]:
+    """Convert Task models to response schemas.
+
+    Assignee names, subtask counts and blockers are fetched for the whole
+    batch — three queries however many tasks there are — rather than one
+    query per assignee, per subtask count and per blocker.
+    """
+    if not tasks:
+        return []
+
+    agent_ids = {t.assigned_to for t in tasks if t.assigned_to}
+    agent_names: dict[str, str] = {}
+    if agent_ids:
+        agents_result = await db.execute(
+            select(Agent.id, Agent.name).where(Agent.id.in_(agent_ids))
         )
-        agent = agent_result.scalar_one_or_none()
-        if agent:
-            assigned_agent_name = agent.name
+        agent_names = dict(agents_result.all())
 
-    # Count subtasks
     subtask_result = await db.execute(
-        select(Task).where(Task.parent_task_id == task.id)
+        select(Task.parent_task_id, func.count(Task.id))
+        .where(Task.parent_task_id.in_([t.id for t in tasks]))
+        .group_by(Task.parent_task_id)
     )
-    subtask_count = len(subtask_result.scalars().all())
+    subtask_counts = dict(subtask_result.all())
 
-    # Get blocker information
-    blocked_by = task.blocked_by
-    blocked_by_titles = []
-    is_blocked = False
-    
-    if blocked_by:
-        for blocker_id in blocked_by:
-            blocker_result = await db.execute(
-                select(Task).where(Task.id == blocker_id)
-            )
-            blocker = blocker_result.scalar_one_or_none()
-            if blocker:
-                blocked_by_titles.append(blocker.title)
-                if blocker.status != "completed":
-                    is_blocked = True
+    blocker_ids = {b for t in tasks for b in t.blocked_by}
+    blockers: dict[str, tuple[str, str]] = {}  # blocker_id -> (title, status)
+    if blocker_ids:
+        blockers_result = await db.execute(
+            select(Task.id, Task.title, Task.status).where(Task.id.in_(blocker_ids))
+        )
+        blockers = {row.id: (row.title, row.status) for row in blockers_result}
 
-    return TaskResponse(
-        id=task.id,
-        project_id=task.project_id,
-        title=task.title,
-        description=task.description,
-        team=task.team,
-        assigned_to=task.assigned_to,
-        assigned_agent_name=assigned_agent_name,
-        status=task.status,
-        priority=task.priority,
-        parent_task_id=task.parent_task_id,
-        subtask_count=subtask_count,
-        blocked_by=blocked_by,
-        blocked_by_titles=blocked_by_titles,
-        is_blocked=is_blocked,
-        created_at=task.created_at.isoformat(),
-        updated_at=task.updated_at.isoformat(),
-    )
+    responses = []
+    for task in tasks:
+        blocked_by = task.blocked_by
+        found = [blockers[b] for b in blocked_by if b in blockers]
+        responses.append(TaskResponse(
+            id=task.id,
+            project_id=task.project_id,
+            title=task.title,
+            description=task.description,
+            team=task.team,
+            assigned_to=task.assigned_to,
+            assigned_agent_name=agent_names.get(task.assigned_to),
+            status=task.status,
+            priority=task.priority,
+            parent_task_id=task.parent_task_id,
+            subtask_count=subtask_counts.get(task.id, 0),
+            blocked_by=blocked_by,
+            blocked_by_titles=[title for title, _ in found],
+            is_blocked=any(status != "completed" for _, status in found),
+            created_at=task.created_at.isoformat(),
+            updated_at=task.updated_at.isoformat(),
+        ))
+    return responses
+
+
+async def task_to_response(task: Task, db: AsyncSession) -> TaskResponse:
+    """Convert Task model to response schema."""
+    return (await tasks_to_responses([task], db))[0]
 
 
 @router.get("", response_model=TaskListResponse)
@@ -132,10 +142,7 @@ async def list_tasks(
     parent_only: bool = True,
 ) -> TaskListResponse:
     """List tasks, optionally filtered. Optimized to avoid N+1 queries."""
-    from sqlalchemy.orm import selectinload
-    from sqlalchemy import func
-    
-    query = select(Task).options(selectinload(Task.assigned_agent))
+    query = select(Task)
 
     if project_id:
         query = query.where(Task.project_id == project_id)
@@ -150,100 +157,9 @@ async def list_tasks(
 
     result = await db.execute(query.order_by(Task.priority.desc(), Task.created_at))
     tasks = list(result.scalars().all())
-    
-    if not tasks:
-        return TaskListResponse(tasks=[], total=0)
-    
-    task_ids = [t.id for t in tasks]
-    
-    # ============================================================
-    # BATCH QUERY 1: Pre-fetch all agents for tasks
-    # ============================================================
-    agent_ids = [t.assigned_to for t in tasks if t.assigned_to]
-    agents_map = {}
-    if agent_ids:
-        agents_result = await db.execute(select(Agent).where(Agent.id.in_(agent_ids)))
-        for agent in agents_result.scalars().all():
-            agents_map[agent.id] = agent.name
-
-    # ============================================================
-    # BATCH QUERY 2: Count subtasks for all tasks at once
-    # ============================================================
-    subtask_counts = {}
-    subtask_query = (
-        select(Task.parent_task_id, func.count(Task.id))
-        .where(Task.parent_task_id.in_(task_ids))
-        .group_by(Task.parent_task_id)
-    )
-    subtask_result = await db.execute(subtask_query)
-    for parent_id, count in subtask_result:
-        subtask_counts[parent_id] = count
-
-    # ============================================================
-    # BATCH QUERY 3: Pre-fetch all blocker tasks at once
-    # ============================================================
-    all_blocker_ids = set()
-    for task in tasks:
-        if task.blocked_by:
-            all_blocker_ids.update(task.blocked_by)
-    
-    blockers_map = {}  # blocker_id -> (title, status)
-    if all_blocker_ids:
-        blockers_result = await db.execute(
-            select(Task.id, Task.title, Task.status).where(Task.id.in_(list(all_blocker_ids)))
-        )
-        for blocker_id, title, status in blockers_result:
-            blockers_map[blocker_id] = (title, status)
-
-    # ============================================================
-    # BUILD RESPONSES - No more DB queries needed!
-    # ============================================================
-    responses = []
-    for task in tasks:
-        # Get agent name from pre-fetched map or relationship
-        agent_name = None
-        if task.assigned_to:
-            if task.assigned_agent:
-                agent_name = task.assigned_agent.name
-            else:
-                agent_name = agents_map.get(task.assigned_to)
-        
-        # Get subtask count from pre-fetched map
-        subtask_count = subtask_counts.get(task.id, 0)
-        
-        # Get blocker info from pre-fetched map
-        blocked_by_ids = task.blocked_by or []
-        blocked_by_titles = []
-        is_blocked = False
-        
-        for blocker_id in blocked_by_ids:
-            if blocker_id in blockers_map:
-                title, status = blockers_map[blocker_id]
-                blocked_by_titles.append(title)
-                if status != "completed":
-                    is_blocked = True
-        
-        responses.append(TaskResponse(
-            id=task.id,
-            project_id=task.project_id,
-            title=task.title,
-            description=task.description,
-            team=task.team,
-            assigned_to=task.assigned_to,
-            assigned_agent_name=agent_name,
-            status=task.status,
-            priority=task.priority,
-            parent_task_id=task.parent_task_id,
-            subtask_count=subtask_count,
-            blocked_by=blocked_by_ids,
-            blocked_by_titles=blocked_by_titles,
-            is_blocked=is_blocked,
-            created_at=task.created_at.isoformat(),
-            updated_at=task.updated_at.isoformat(),
-        ))
 
     return TaskListResponse(
-        tasks=responses,
+        tasks=await tasks_to_responses(tasks, db),
         total=len(tasks),
     )
 
@@ -255,42 +171,31 @@ async def create_task(
 ) -> TaskResponse:
     """Create a new task."""
     # Verify project exists and get config
-    project_result = await db.execute(
-        select(Project).where(Project.id == task.project_id)
-    )
-    project = project_result.scalar_one_or_none()
+    project = await db.get(Project, task.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     # Verify agent exists if assigned
     if task.assigned_to:
-        agent_result = await db.execute(
-            select(Agent).where(Agent.id == task.assigned_to)
-        )
-        if not agent_result.scalar_one_or_none():
+        if await db.get(Agent, task.assigned_to) is None:
             raise HTTPException(status_code=404, detail="Assigned agent not found")
 
     # Verify parent task exists if specified
     if task.parent_task_id:
-        parent_result = await db.execute(
-            select(Task).where(Task.id == task.parent_task_id)
-        )
-        if not parent_result.scalar_one_or_none():
+        if await db.get(Task, task.parent_task_id) is None:
             raise HTTPException(status_code=404, detail="Parent task not found")
 
     # Set initial status - if task has blockers that aren't completed, mark as blocked
     initial_status = "pending"
     if task.blocked_by:
-        # Check if any blockers are not completed
-        for blocker_id in task.blocked_by:
-            blocker_result = await db.execute(
-                select(Task).where(Task.id == blocker_id)
-            )
-            blocker = blocker_result.scalar_one_or_none()
-            if blocker and blocker.status != "completed":
-                initial_status = "blocked"
-                break
-    
+        open_blocker = await db.scalar(
+            select(Task.id)
+            .where(Task.id.in_(task.blocked_by), Task.status != "completed")
+            .limit(1)
+        )
+        if open_blocker is not None:
+            initial_status = "blocked"
+
     db_task = Task(
         project_id=task.project_id,
         title=task.title,
@@ -303,8 +208,9 @@ async def create_task(
     )
     db_task.blocked_by = task.blocked_by
     db.add(db_task)
+    # The flush assigns the id and timestamps from their Python defaults, so
+    # there is nothing to read back.
     await db.flush()
-    await db.refresh(db_task)
 
     response = await task_to_response(db_task, db)
 
@@ -331,8 +237,7 @@ async def get_task(
     db: AsyncSession = Depends(get_db),
 ) -> TaskResponse:
     """Get a task by ID."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
+    task = await db.get(Task, task_id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -347,8 +252,7 @@ async def get_subtasks(
 ) -> TaskListResponse:
     """Get subtasks of a task."""
     # Verify parent task exists
-    parent_result = await db.execute(select(Task).where(Task.id == task_id))
-    if not parent_result.scalar_one_or_none():
+    if await db.get(Task, task_id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
     result = await db.execute(
@@ -356,10 +260,10 @@ async def get_subtasks(
         .where(Task.parent_task_id == task_id)
         .order_by(Task.priority.desc(), Task.created_at)
     )
-    tasks = result.scalars().all()
+    tasks = list(result.scalars().all())
 
     return TaskListResponse(
-        tasks=[await task_to_response(t, db) for t in tasks],
+        tasks=await tasks_to_responses(tasks, db),
         total=len(tasks),
     )
 
@@ -371,8 +275,7 @@ async def update_task(
     db: AsyncSession = Depends(get_db),
 ) -> TaskResponse:
     """Update a task."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
+    task = await db.get(Task, task_id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -386,10 +289,7 @@ async def update_task(
         task.team = update.team
     if update.assigned_to is not None:
         # Verify agent exists
-        agent_result = await db.execute(
-            select(Agent).where(Agent.id == update.assigned_to)
-        )
-        if not agent_result.scalar_one_or_none():
+        if await db.get(Agent, update.assigned_to) is None:
             raise HTTPException(status_code=404, detail="Assigned agent not found")
         task.assigned_to = update.assigned_to
     if update.status is not None:
@@ -399,10 +299,7 @@ async def update_task(
         # If task is moved back from in_progress, update the agent's status to idle
         if old_status == "in_progress" and update.status in ["pending", "blocked"]:
             if task.assigned_to:
-                agent_result = await db.execute(
-                    select(Agent).where(Agent.id == task.assigned_to)
-                )
-                agent = agent_result.scalar_one_or_none()
+                agent = await db.get(Agent, task.assigned_to)
                 if agent and agent.status == "working":
                     agent.status = "idle"
                     # Broadcast agent status update
@@ -424,10 +321,7 @@ async def update_task(
         if update.status is None:  # Only auto-update status if not explicitly set
             is_blocked = False
             for blocker_id in update.blocked_by:
-                blocker_result = await db.execute(
-                    select(Task).where(Task.id == blocker_id)
-                )
-                blocker = blocker_result.scalar_one_or_none()
+                blocker = await db.get(Task, blocker_id)
                 if blocker and blocker.status != "completed":
                     is_blocked = True
                     break
@@ -487,10 +381,7 @@ async def unblock_dependent_tasks(db: AsyncSession, completed_task_id: str, proj
         # Check if all blockers are now completed
         all_blockers_done = True
         for blocker_id in blocked_by:
-            blocker_result = await db.execute(
-                select(Task).where(Task.id == blocker_id)
-            )
-            blocker = blocker_result.scalar_one_or_none()
+            blocker = await db.get(Task, blocker_id)
             if blocker and blocker.status != "completed":
                 all_blockers_done = False
                 break
@@ -524,8 +415,7 @@ async def delete_task(
     db: AsyncSession = Depends(get_db),
 ) -> None:
     """Delete a task."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
+    task = await db.get(Task, task_id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -565,21 +455,15 @@ async def get_task_logs(
     Returns all activity logs related to this task,
     including Claude Code responses and file changes.
     """
-    from teamwork.models import ActivityLog
-    
     # Get task
-    task_result = await db.execute(select(Task).where(Task.id == task_id))
-    task = task_result.scalar_one_or_none()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Get assigned agent name
     assigned_agent_name = None
     if task.assigned_to:
-        agent_result = await db.execute(
-            select(Agent).where(Agent.id == task.assigned_to)
-        )
-        agent = agent_result.scalar_one_or_none()
+        agent = await db.get(Agent, task.assigned_to)
         if agent:
             assigned_agent_name = agent.name
     
@@ -594,29 +478,29 @@ async def get_task_logs(
     all_logs = logs_result.scalars().all()
     
     # Filter logs for this specific task
-    task_logs = []
+    matching = [log for log in all_logs if (log.extra_data or {}).get("task_id") == task_id]
+
+    # Resolve every author's name in one query rather than one per log
+    agent_ids = {log.agent_id for log in matching}
     agent_names: dict[str, str] = {}
-    
-    for log in all_logs:
-        extra = log.extra_data or {}
-        if extra.get("task_id") == task_id:
-            # Get agent name if not cached
-            if log.agent_id not in agent_names:
-                agent_result = await db.execute(
-                    select(Agent).where(Agent.id == log.agent_id)
-                )
-                agent = agent_result.scalar_one_or_none()
-                agent_names[log.agent_id] = agent.name if agent else "Unknown"
-            
-            task_logs.append(TaskLogEntry(
-                id=log.id,
-                agent_id=log.agent_id,
-                agent_name=agent_names.get(log.agent_id),
-                activity_type=log.activity_type,
-                description=log.description,
-                extra_data=log.extra_data,
-                created_at=log.created_at.isoformat(),
-            ))
+    if agent_ids:
+        name_rows = await db.execute(
+            select(Agent.id, Agent.name).where(Agent.id.in_(agent_ids))
+        )
+        agent_names = dict(name_rows.tuples().all())
+
+    task_logs = [
+        TaskLogEntry(
+            id=log.id,
+            agent_id=log.agent_id,
+            agent_name=agent_names.get(log.agent_id, "Unknown"),
+            activity_type=log.activity_type,
+            description=log.description,
+            extra_data=log.extra_data,
+            created_at=log.created_at.isoformat(),
+        )
+        for log in matching
+    ]
     
     # Sort by created_at ascending (oldest first)
     task_logs.sort(key=lambda x: x.created_at)
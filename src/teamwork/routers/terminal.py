@@ -15,12 +15,13 @@ import os
 import pty
 import re
 import select
+import shutil
 import subprocess
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Query
 from pydantic import BaseModel
-from sqlalchemy import select as sa_select
 
 from teamwork.config import settings
 
@@ -50,24 +51,64 @@ class TerminalSession:
     output_chunks: list[str] = field(default_factory=list)
     websocket: WebSocket | None = None
     drain_task: asyncio.Task | None = None
+    # Set, then replaced with a fresh one, whenever output is recorded, so a
+    # waiter wakes on the output itself rather than polling the buffer. Each
+    # waiter holds on to the event it saw; nobody clears shared state, so two
+    # execs on one session can't reset each other's wakeup.
+    new_output: asyncio.Event = field(default_factory=asyncio.Event)
 
     def record_output(self, text: str) -> None:
         self.output_chunks.append(text)
+        self.new_output.set()
+        self.new_output = asyncio.Event()
         # Keep bounded — drop oldest chunks
         if len(self.output_chunks) > 2000:
             self.output_chunks = self.output_chunks[-1000:]
 
     def replay_text(self, max_bytes: int = 200_000) -> str:
         """Return the recent output, capped so a fresh attach doesn't dump megabytes."""
-        out = "".join(self.output_chunks)
-        if len(out) > max_bytes:
-            return out[-max_bytes:]
-        return out
+        # Join only the newest chunks that cover the cap, not the whole
+        # (up to 2000-chunk) history just to slice its tail off.
+        tail: list[str] = []
+        size = 0
+        for chunk in reversed(self.output_chunks):
+            tail.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        out = "".join(reversed(tail))
+        return out[-max_bytes:] if size > max_bytes else out
 
 
 _active_sessions: dict[str, TerminalSession] = {}  # project_id -> session
 
 
+# Everything stripped from PTY output before an agent reads it, as one
+# alternation so the buffer is scanned once:
+#   - CSI sequences, including private-mode (?, >, <, =) prefixes — the older
+#     `[0-9;]*` pattern missed bracketed-paste sequences like \x1b[?2004l,
+#     leaving them in the agent-facing output and tanking the model's
+#     command-generation accuracy when the context is littered with them.
+#   - OSC sequences — chromium and bash sometimes emit \x1b]0;<title>\x07 to
+#     set window title; useless to the agent.
+#   - Carriage returns.
+_TERMINAL_NOISE = re.compile(r'\x1b\[[\?>=]?[0-9;]*[a-zA-Z]|\x1b\][^\x07]*\x07|\r')
+
+
+def _strip_terminal_noise(raw: str) -> str:
+    return _TERMINAL_NOISE.sub('', raw)
+
+
+@lru_cache(maxsize=1)
+def _docker_cli() -> str | None:
+    """Path of the docker CLI, looked up once.
+
+    ``shutil.which`` stats every $PATH entry, and the answer only changes if
+    docker is installed or removed under a running server.
+    """
+    return shutil.which("docker")
+
+
 # ---------------------------------------------------------------------------
 # REST endpoints
 # ---------------------------------------------------------------------------
@@ -93,13 +134,13 @@ class TerminalExecRequest(BaseModel):
 @router.get("/info")
 async def get_terminal_info() -> TerminalInfo:
     """Check terminal capabilities."""
-    import shutil
-
-    docker_available = shutil.which("docker") is not None
+    docker_available = _docker_cli() is not None
     sandbox_running = False
 
     if docker_available and settings.sandbox_container:
-        check = subprocess.run(
+        # `docker ps` blocks for as long as the daemon takes; keep it off the loop.
+        check = await asyncio.to_thread(
+            subprocess.run,
             ["docker", "ps", "--filter", f"name={settings.sandbox_container}",
              "--format", "{{.Names}}"],
             capture_output=True, text=True,
@@ -124,20 +165,18 @@ async def terminal_recent(project_id: str, lines: int = 50):
     if not session:
         raise HTTPException(404, "No active terminal session")
 
-    # Join all buffered output and take last N lines
-    raw = "".join(session.output_chunks)
-    # Strip ANSI escape codes for readable output
-    # Standard CSI + private-mode (?, >, <, =) prefixes — the older
-    # `[0-9;]*` pattern missed bracketed-paste sequences like
-    # \x1b[?2004l, leaving them in the agent-facing output and tanking
-    # the model's command-generation accuracy when the context is
-    # littered with them.
-    clean = re.sub(r'\x1b\[[\?>=]?[0-9;]*[a-zA-Z]', '', raw)
-    # Drop OSC sequences too — chromium and bash sometimes emit
-    # \x1b]0;<title>\x07 to set window title; useless to the agent.
-    clean = re.sub(r'\x1b\][^\x07]*\x07', '', clean)
-    clean = clean.replace('\r', '')
-    output_lines = clean.strip().split('\n')
+    # Clean only the tail of the buffer, not all of it: start from the last
+    # 16 KB and widen until it holds more than N lines or is the whole buffer.
+    # The first line of a partial window may be cut mid-sequence, but with
+    # more than N lines it is never part of the result.
+    window = 16_384
+    while True:
+        raw = session.replay_text(max_bytes=window)
+        # Strip ANSI escape codes for readable output
+        output_lines = _strip_terminal_noise(raw).strip().split('\n')
+        if len(output_lines) > lines or len(raw) < window:
+            break
+        window *= 4
     recent = "\n".join(output_lines[-lines:])
     return {"output": recent}
 
@@ -180,37 +219,23 @@ async def terminal_exec(project_id: str, body: TerminalExecRequest):
     except OSError as e:
         raise HTTPException(500, str(e))
 
-    # Wait for output to settle — poll until no new output for 0.3s
-    deadline = asyncio.get_event_loop().time() + body.timeout
-    prev_len = capture_start
-    quiet_cycles = 0
-
-    while asyncio.get_event_loop().time() < deadline:
-        await asyncio.sleep(0.1)
-        cur_len = len(session.output_chunks)
-        if cur_len > prev_len:
-            prev_len = cur_len
-            quiet_cycles = 0
-        else:
-            quiet_cycles += 1
-            if quiet_cycles >= 3:  # 0.3s of silence
-                break
+    # Wait for output to settle — until no new output for 0.3s.  The drain
+    # task signals each chunk, so this returns 0.3s after the last one
+    # instead of on the next tick of a polling loop.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + body.timeout
+
+    while (remaining := deadline - loop.time()) > 0:
+        try:
+            await asyncio.wait_for(session.new_output.wait(), min(0.3, remaining))
+        except asyncio.TimeoutError:
+            break  # 0.3s of silence
 
     # Collect output since command was sent
     raw = "".join(session.output_chunks[capture_start:])
 
     # Strip ANSI escape codes for clean output
-    # Standard CSI + private-mode (?, >, <, =) prefixes — the older
-    # `[0-9;]*` pattern missed bracketed-paste sequences like
-    # \x1b[?2004l, leaving them in the agent-facing output and tanking
-    # the model's command-generation accuracy when the context is
-    # littered with them.
-    clean = re.sub(r'\x1b\[[\?>=]?[0-9;]*[a-zA-Z]', '', raw)
-    # Drop OSC sequences too — chromium and bash sometimes emit
-    # \x1b]0;<title>\x07 to set window title; useless to the agent.
-    clean = re.sub(r'\x1b\][^\x07]*\x07', '', clean)
-    # Strip carriage returns
-    clean = clean.replace('\r', '')
+    clean = _strip_terminal_noise(raw)
 
     return {"output": clean.strip()}
 
@@ -245,10 +270,7 @@ async def terminal_websocket(
     from teamwork.models.base import AsyncSessionLocal
 
     async with AsyncSessionLocal() as db:
-        result = await db.execute(
-            sa_select(Project).where(Project.id == project_id)
-        )
-        project = result.scalar_one_or_none()
+        project = await db.get(Project, project_id)
         if project and project.workspace_dir:
             workspace_subdir = project.workspace_dir
         else:
@@ -326,8 +348,6 @@ async def _spawn_terminal_session(
     different and much more dangerous thing. When the sandbox is unavailable the
     honest answer is no terminal.
     """
-    import shutil
-
     container = settings.sandbox_container
     if not container:
         await websocket.send_text(
@@ -337,10 +357,11 @@ async def _spawn_terminal_session(
         )
         return None
 
-    if not shutil.which("docker"):
+    if not _docker_cli():
         await websocket.send_text("\x1b[31mDocker not available.\x1b[0m\r\n")
         return None
-    check = subprocess.run(
+    check = await asyncio.to_thread(
+        subprocess.run,
         ["docker", "ps", "--filter", f"name={container}", "--format", "{{.Names}}"],
         capture_output=True, text=True,
     )
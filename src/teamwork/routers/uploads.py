@@ -35,6 +35,10 @@ ALLOWED_EXTENSIONS = {
 }
 
 
+# Both path separators map to "_" in one translate() pass over the name.
+_PATH_SEPARATORS = str.maketrans({"/": "_", "\\": "_"})
+
+
 @router.post("/{project_id}")
 async def upload_file(
     project_id: str,
@@ -60,7 +64,7 @@ async def upload_file(
     upload_dir.mkdir(parents=True, exist_ok=True)
 
     file_id = uuid4().hex[:12]
-    safe_name = file.filename.replace("/", "_").replace("\\", "_")
+    safe_name = file.filename.translate(_PATH_SEPARATORS)
     stored_name = f"{file_id}_{safe_name}"
     dest = upload_dir / stored_name
 
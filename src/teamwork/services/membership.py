@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 
-from sqlalchemy import select
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from teamwork.models.channel import Channel
@@ -104,9 +104,15 @@ async def may_post(db: AsyncSession, *, channel_id: str, agent_id: str | None,
         return True, ""
     if agent_id is None:
         return True, ""                      # system/human messages are not scoped here
-    if not await has_any_members(db, channel_id=channel_id):
-        return True, ""
-    if await is_member(db, channel_id=channel_id, member_id=agent_id):
+    # Both questions in one round-trip — this runs on every enforced post.
+    in_channel = ChannelMember.channel_id == channel_id
+    has_members, member = (await db.execute(select(
+        exists().where(in_channel),
+        exists().where(in_channel,
+                       ChannelMember.member_type == MEMBER_AGENT,
+                       ChannelMember.member_id == agent_id),
+    ))).one()
+    if not has_members or member:
         return True, ""
     return False, "this agent is not a member of that channel"
 
@@ -0,0 +1,38 @@
+"""Shared outbound HTTP client for the Prax proxies and the summarizer."""
+
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+# The Prax proxy routers (prax, scheduler, claude_code, agent_plan, library,
+# memory) call the same backend over and over — the model badge and the
+# Library panes poll it — and compaction sends its chunks to the summarizer
+# back to back. A client per request paid for a new SSL context, a new
+# connection pool and a new TCP connection every time; one process-wide client
+# keeps those connections alive between requests. Timeouts differ per caller,
+# so each request passes its own.
+#
+# The summarizer's endpoint is user-supplied and its requests carry the
+# caller's API key, so the client accepts no cookies: nothing one upstream
+# sets may ride along on a request to another. Agent webhooks use their own
+# client in routers/messages.py.
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client, if one was opened."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
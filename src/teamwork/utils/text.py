@@ -51,7 +51,7 @@ def parse_json_or_default(text: str, default: T, context: str = "") -> T | Any:
         return json.loads(strip_markdown_json(text))
     except json.JSONDecodeError as e:
         log_context = f" ({context})" if context else ""
-        logger.warning(f"JSON parse error{log_context}: {e}")
+        logger.warning("JSON parse error%s: %s", log_context, e)
         return default
 
 
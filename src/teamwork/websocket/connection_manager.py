@@ -1,14 +1,24 @@
 """WebSocket connection manager for real-time updates."""
 
-import json
+import asyncio
+import contextlib
 from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
+import orjson
 from fastapi import WebSocket
 
+# How many sends a broadcast keeps in flight at once. Each send holds a
+# buffered frame, so an unbounded fan-out over a big room spikes memory.
+_FAN_OUT_BATCH = 64
+# A client that can't take a frame within this long is treated as gone.
+# Without it a stalled socket would hold its send slot indefinitely.
+_SEND_TIMEOUT = 10.0
+
 
 class EventType(str, Enum):
     """Types of WebSocket events."""
@@ -30,19 +40,31 @@ class EventType(str, Enum):
     CONNECTED = "connected"
 
 
-@dataclass
+@dataclass(slots=True)
 class WebSocketEvent:
-    """Represents a WebSocket event to be sent to clients."""
+    """Represents a WebSocket event to be sent to clients.
+
+    Slotted: one is built per broadcast, and without a per-instance
+    ``__dict__`` each costs a single small allocation.
+    """
 
     type: EventType
     data: dict[str, Any]
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    # Left as a datetime: to_json() encodes it, so no string is built up front.
+    timestamp: datetime | str = field(default_factory=datetime.utcnow)
     project_id: str | None = None
     channel_id: str | None = None
 
     def to_json(self) -> str:
-        """Serialize the event to JSON."""
-        return json.dumps(
+        """Serialize the event to JSON.
+
+        orjson rather than the stdlib: this runs on every broadcast, and
+        orjson also encodes ``datetime`` values in ``data``
+        directly (ISO 8601, same as ``.isoformat()``). The result is still
+        sent as a text frame — the UI parses ``event.data`` as a string, and a
+        binary frame would reach it as a Blob.
+        """
+        return orjson.dumps(
             {
                 "type": self.type.value,
                 "data": self.data,
@@ -50,7 +72,7 @@ class WebSocketEvent:
                 "projectId": self.project_id,
                 "channelId": self.channel_id,
             }
-        )
+        ).decode()
 
 
 class ConnectionManager:
@@ -124,42 +146,64 @@ class ConnectionManager:
     ) -> None:
         """Broadcast an event to all connections subscribed to a project."""
         event.project_id = project_id
-        dead_connections: list[WebSocket] = []
-        for websocket in self._project_connections.get(project_id, set()):
-            try:
-                await websocket.send_text(event.to_json())
-            except Exception:
-                dead_connections.append(websocket)
-        # Clean up dead connections
-        for ws in dead_connections:
-            self.disconnect(ws)
+        await self._fan_out(self._project_connections.get(project_id, ()), event)
 
     async def broadcast_to_channel(
         self, channel_id: str, event: WebSocketEvent
     ) -> None:
         """Broadcast an event to all connections subscribed to a channel."""
         event.channel_id = channel_id
-        dead_connections: list[WebSocket] = []
-        for websocket in self._channel_connections.get(channel_id, set()):
-            try:
-                await websocket.send_text(event.to_json())
-            except Exception:
-                dead_connections.append(websocket)
-        # Clean up dead connections
-        for ws in dead_connections:
-            self.disconnect(ws)
+        await self._fan_out(self._channel_connections.get(channel_id, ()), event)
+
+    async def broadcast_to_channel_and_project(
+        self, channel_id: str, project_id: str, event: WebSocketEvent
+    ) -> None:
+        """Broadcast to a channel's and its project's subscribers, once each.
+
+        Most clients subscribe to both; two separate broadcasts would hand
+        them the same event twice.
+        """
+        event.channel_id = channel_id
+        event.project_id = project_id
+        await self._fan_out(
+            self._channel_connections.get(channel_id, set())
+            | self._project_connections.get(project_id, set()),
+            event,
+        )
 
     async def broadcast_all(self, event: WebSocketEvent) -> None:
         """Broadcast an event to all active connections."""
-        dead_connections: list[WebSocket] = []
-        for websocket in self._active_connections:
-            try:
-                await websocket.send_text(event.to_json())
-            except Exception:
-                dead_connections.append(websocket)
-        # Clean up dead connections
-        for ws in dead_connections:
-            self.disconnect(ws)
+        await self._fan_out(self._active_connections, event)
+
+    async def _fan_out(self, websockets: Iterable[WebSocket], event: WebSocketEvent) -> None:
+        """Send ``event`` to every connection at once, dropping any that fail.
+
+        The event is serialized once and the same text goes to every
+        subscriber. At most ``_FAN_OUT_BATCH`` sends are in flight, and each
+        finished send frees its slot for the next, so one slow client delays
+        nobody else. A send that fails or takes longer than ``_SEND_TIMEOUT``
+        drops the connection and closes the socket — a timed-out send may have
+        left half a frame on the wire, and a socket left open would just stop
+        receiving events without the client noticing. Closing it hands over
+        to the frontend's reconnect logic. The targets are copied first: a
+        connection can disconnect while the sends are in flight.
+        """
+        targets = list(websockets)
+        if not targets:
+            return
+        text = event.to_json()
+        slots = asyncio.Semaphore(_FAN_OUT_BATCH)
+
+        async def send(websocket: WebSocket) -> None:
+            async with slots:
+                try:
+                    await asyncio.wait_for(websocket.send_text(text), _SEND_TIMEOUT)
+                except Exception:
+                    self.disconnect(websocket)
+                    with contextlib.suppress(Exception):
+                        await asyncio.wait_for(websocket.close(code=1011), _SEND_TIMEOUT)
+
+        await asyncio.gather(*(send(websocket) for websocket in targets))
 
     @property
     def active_connection_count(self) -> int:
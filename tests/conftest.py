@@ -89,6 +89,10 @@ def client() -> TestClient:
 
     async def _reset():
         async with engine.begin() as conn:
+            # The FTS index is created by init_db's migration, not the
+            # metadata; drop it too so the next app start rebuilds it along
+            # with its triggers on the fresh messages table.
+            await conn.exec_driver_sql("DROP TABLE IF EXISTS messages_fts")
             await conn.run_sync(Base.metadata.drop_all)
             await conn.run_sync(Base.metadata.create_all)
 
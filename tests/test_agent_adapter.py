@@ -62,6 +62,11 @@ def test_prompt_strips_the_mention_and_labels_the_speaker():
     assert prompt == "TJ: what is 2+2?"
 
 
+def test_prompt_strips_the_mention_in_any_case():
+    prompt = _agent().build_prompt({"agent_name": "TJ", "content": "@Goose hi @GOOSE"})
+    assert prompt == "TJ: hi"
+
+
 def test_prompt_falls_back_to_a_generic_speaker():
     assert _agent().build_prompt({"content": "@goose hi"}).startswith("user:")
 
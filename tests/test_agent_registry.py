@@ -223,3 +223,50 @@ def test_display_name_falls_back_to_the_key_name(registry):
     registry.write_text(json.dumps([{"name": "hand-rolled", "token": "t", "mcp": True}]))
     client = resolve_client("t", load_clients(str(registry)))
     assert client.display_name == "hand-rolled"
+
+
+# ── Reading it back ──────────────────────────────────────────────────────────
+
+def test_an_unchanged_registry_is_parsed_once(registry, monkeypatch):
+    """Every external request loads the registry; the file is only re-read
+    when it changes."""
+    from teamwork import agent_auth
+
+    reg.grant_space("project-a")
+    calls = []
+    parse = agent_auth._parse_registry
+    monkeypatch.setattr(agent_auth, "_parse_registry", lambda p: calls.append(p) or parse(p))
+
+    load_clients(str(registry))
+    load_clients(str(registry))
+
+    assert len(calls) == 1
+
+
+def test_a_revocation_takes_effect_on_the_next_load(registry):
+    # A cached registry must never keep a revoked credential alive.
+    result = reg.grant_space("project-a")
+    assert resolve_client(result["token"], load_clients(str(registry))) is not None
+
+    reg.revoke_space("project-a")
+    assert resolve_client(result["token"], load_clients(str(registry))) is None
+
+
+def test_an_unreadable_registry_is_re_read_on_the_next_load(registry, monkeypatch):
+    # A read that races a partial write must not lock every agent out until
+    # the file happens to change again.
+    from teamwork import agent_auth
+
+    result = reg.grant_space("project-a")
+    agent_auth._registry_cache.clear()
+    parse = agent_auth._parse_registry
+    calls = []
+
+    def flaky(p):
+        calls.append(p)
+        return None if len(calls) == 1 else parse(p)
+
+    monkeypatch.setattr(agent_auth, "_parse_registry", flaky)
+
+    assert load_clients(str(registry)) == []
+    assert resolve_client(result["token"], load_clients(str(registry))) is not None
@@ -24,3 +24,16 @@ def test_health_endpoint():
     assert resp.status_code == 200
     data = resp.json()
     assert data["status"] == "healthy"
+
+
+async def test_every_connection_gets_the_sqlite_settings():
+    from sqlalchemy import text
+
+    from teamwork.models.base import engine
+
+    async with engine.connect() as conn:
+        busy = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+        sync = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        cache = (await conn.execute(text("PRAGMA cache_size"))).scalar()
+
+    assert (busy, sync, cache) == (5000, 2, -32000)  # 2 == FULL, the durable default
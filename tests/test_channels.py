@@ -0,0 +1,30 @@
+"""Tests for the channels router."""
+
+
+def test_a_project_without_channels_gets_the_defaults_once(client):
+    pid = client.post("/api/projects", json={"name": "Fresh"}).json()["id"]
+
+    first = client.get(f"/api/channels?project_id={pid}").json()["channels"]
+    again = client.get(f"/api/channels?project_id={pid}").json()["channels"]
+
+    assert [c["name"] for c in first] == ["general", "random"]
+    assert [c["id"] for c in again] == [c["id"] for c in first]
+    assert client.get(f"/api/projects/{pid}").json()["config"]["channels_initialized"] is True
+
+
+def test_the_defaults_include_a_channel_per_agent_team(client):
+    pid = client.post("/api/projects", json={"name": "Teams"}).json()["id"]
+    for name, team in (("A", "Core Platform"), ("B", "Core Platform"), ("C", None), ("D", "")):
+        client.post("/api/agents", json={
+            "project_id": pid, "name": name, "role": "dev", "team": team,
+        })
+
+    channels = client.get(f"/api/channels?project_id={pid}").json()["channels"]
+
+    assert sorted((c["name"], c["type"], c["team"]) for c in channels) == [
+        ("core-platform", "team", "Core Platform"),
+        ("general", "public", None),
+        ("random", "public", None),
+    ]
+    again = client.get(f"/api/channels?project_id={pid}").json()["channels"]
+    assert {c["id"] for c in again} == {c["id"] for c in channels}
@@ -99,6 +99,35 @@ def test_create_agent(client):
     assert "agent_id" in data
 
 
+def test_list_projects_keeps_each_projects_channels_and_agents_apart(client):
+    first = _create_project(client)
+    second = client.post("/api/external/projects", json={
+        "name": "Second", "webhook_url": "http://agent:9000/webhook",
+    }).json()
+    client.post(f"/api/external/projects/{second['project_id']}/agents", json={"name": "Solo"})
+
+    listed = {p["project_id"]: p for p in client.get("/api/external/projects").json()}
+
+    assert listed[first["project_id"]]["channels"] == first["channels"]
+    assert listed[second["project_id"]]["channels"] == second["channels"]
+    assert listed[first["project_id"]]["agents"] == {}
+    assert list(listed[second["project_id"]]["agents"]) == ["Solo"]
+
+
+def test_ensure_channels_creates_only_the_missing_ones(client):
+    project = _create_project(client)
+    pid = project["project_id"]
+
+    resp = client.post(f"/api/external/projects/{pid}/ensure-channels", json={"channels": [
+        {"name": "general"}, {"name": "ops"}, {"name": "ops"}, {"name": ""},
+    ]})
+
+    channels = resp.json()["channels"]
+    assert {k: v for k, v in channels.items() if k != "ops"} == project["channels"]
+    listed = client.get("/api/external/projects").json()[0]["channels"]
+    assert listed["ops"] == channels["ops"]
+
+
 def test_create_multiple_agents(client):
     project = _create_project(client)
     pid = project["project_id"]
@@ -234,6 +263,25 @@ def test_read_messages(client):
     assert len(data["messages"]) >= 3
 
 
+def test_bulk_import_keeps_original_timestamps_and_skips_foreign_channels(client):
+    pid, aid, channels = _create_project_with_agent(client)
+    ch_id = channels["general"]
+
+    resp = client.post(f"/api/external/projects/{pid}/messages/bulk", json={"messages": [
+        {"channel_id": ch_id, "agent_id": aid, "content": "old",
+         "created_at": "2024-01-02T03:04:05Z"},
+        {"channel_id": ch_id, "content": "undated"},
+        {"channel_id": "elsewhere", "content": "dropped"},
+    ]})
+    assert resp.status_code == 201
+    assert resp.json() == {"imported": 2}
+
+    messages = client.get(f"/api/messages/channel/{ch_id}").json()["messages"]
+    assert [m["content"] for m in messages] == ["old", "undated"]
+    assert messages[0]["created_at"].startswith("2024-01-02T03:04:05")
+    assert messages[0]["agent_name"] == "Messenger"
+
+
 def test_typing_indicator(client):
     pid, aid, channels = _create_project_with_agent(client)
 
@@ -0,0 +1,50 @@
+"""Tests for the shared outbound HTTP client used by the Prax proxy routers."""
+
+import httpx
+import respx
+
+from teamwork.config import settings
+from teamwork.routers import library, prax
+from teamwork.utils import http
+
+
+async def test_proxy_calls_share_one_client(monkeypatch):
+    monkeypatch.setattr(settings, "prax_url", "http://prax.test")
+    await http.close_http_client()
+
+    with respx.mock() as router:
+        router.get("http://prax.test/teamwork/status").mock(
+            return_value=httpx.Response(200, json={"ok": True})
+        )
+        router.get("http://prax.test/teamwork/library/spaces").mock(
+            return_value=httpx.Response(200, json={"spaces": []})
+        )
+        assert await prax._proxy("GET", "/status") == {"ok": True}
+        client = http.get_http_client()
+        router.post("http://prax.test/teamwork/library/spaces/s/chat").mock(
+            return_value=httpx.Response(200, json={"reply": "hi"})
+        )
+        assert await library._proxy("GET", "/spaces") == {"spaces": []}
+        assert await library.space_chat("s", {"message": "hello"}) == {"reply": "hi"}
+
+    assert http.get_http_client() is client
+    await http.close_http_client()
+    assert client.is_closed
+    assert http.get_http_client() is not client
+    await http.close_http_client()
+
+
+async def test_the_shared_client_keeps_no_cookies(monkeypatch):
+    monkeypatch.setattr(settings, "prax_url", "http://prax.test")
+    await http.close_http_client()
+
+    with respx.mock() as router:
+        route = router.get("http://prax.test/teamwork/status").mock(
+            return_value=httpx.Response(200, json={}, headers={"set-cookie": "sid=abc; Path=/"})
+        )
+        await prax._proxy("GET", "/status")
+        await prax._proxy("GET", "/status")
+
+    assert "cookie" not in route.calls[1].request.headers
+    assert not http.get_http_client().cookies
+    await http.close_http_client()
@@ -65,11 +65,88 @@ def test_update_project(client):
 # ── Channels ────────────────────────────────────────────────────────────────
 
 
+def test_project_config_changes_are_saved(client):
+    pid = client.post("/api/projects", json={"name": "P", "config": {"a": 1}}).json()["id"]
+
+    def config():
+        return client.get(f"/api/projects/{pid}").json()["config"]
+
+    assert client.patch(f"/api/projects/{pid}", json={
+        "name": "Renamed", "config": {"b": 2},
+    }).json()["config"] == {"a": 1, "b": 2}
+    client.patch(f"/api/projects/{pid}/config", json={"runtime_mode": "docker"})
+    assert config() == {"a": 1, "b": 2, "runtime_mode": "docker"}
+
+    client.post(f"/api/projects/{pid}/pause")
+    project = client.get(f"/api/projects/{pid}").json()
+    assert (project["name"], project["status"], project["config"]["paused"]) == (
+        "Renamed", "paused", True,
+    )
+    assert "paused_at" in project["config"]
+
+    client.post(f"/api/projects/{pid}/resume")
+    assert config() == {"a": 1, "b": 2, "runtime_mode": "docker", "paused": False}
+
+
+def test_an_empty_patch_leaves_updated_at_alone(client):
+    project = client.post("/api/projects", json={"name": "P"}).json()
+
+    patched = client.patch(f"/api/projects/{project['id']}", json={})
+
+    assert patched.status_code == 200
+    assert patched.json()["updated_at"] == project["updated_at"]
+    assert client.patch("/api/projects/nope", json={}).status_code == 404
+
+
+def test_pause_and_resume_count_the_agents_they_change(client):
+    pid = _make_project(client)
+    for name in ("A", "B"):
+        client.post("/api/agents", json={"project_id": pid, "name": name, "role": "dev"})
+
+    assert client.post(f"/api/projects/{pid}/pause").json()["agents_affected"] == 2
+    assert client.post(f"/api/projects/{pid}/resume").json()["agents_affected"] == 2
+    assert client.post(f"/api/projects/{pid}/resume").json()["agents_affected"] == 0
+    assert client.post("/api/projects/nope/pause").status_code == 404
+
+
 def _make_project(client) -> str:
     resp = client.post("/api/projects", json={"name": "Channel Test"})
     return resp.json()["id"]
 
 
+def test_reset_clears_a_projects_progress_but_not_anothers(client, tmp_path, monkeypatch):
+    from teamwork.config import settings
+
+    monkeypatch.setattr(settings, "workspace_path", tmp_path)
+
+    def populate():
+        pid = _make_project(client)
+        aid = client.post("/api/agents", json={
+            "project_id": pid, "name": "Bot", "role": "dev",
+        }).json()["id"]
+        client.patch(f"/api/agents/{aid}/status?status=working")
+        client.post("/api/tasks", json={
+            "project_id": pid, "title": "t", "status": "in_progress", "assigned_to": aid,
+        })
+        cid = client.post("/api/channels", json={"project_id": pid, "name": "c"}).json()["id"]
+        for text in ("one", "two"):
+            client.post("/api/messages", json={"channel_id": cid, "content": text})
+        return pid, aid, cid
+
+    pid, aid, cid = populate()
+    _, other_aid, other_cid = populate()
+
+    reset = client.post(f"/api/projects/{pid}/reset").json()
+
+    assert (reset["tasks_reset"], reset["messages_cleared"]) == (1, 2)
+    [task] = client.get("/api/tasks", params={"project_id": pid}).json()["tasks"]
+    assert (task["status"], task["assigned_to"]) == ("pending", None)
+    assert client.get(f"/api/agents/{aid}").json()["status"] == "idle"
+    assert client.get(f"/api/messages/channel/{cid}").json()["total"] == 0
+    assert client.get(f"/api/messages/channel/{other_cid}").json()["total"] == 2
+    assert client.get(f"/api/agents/{other_aid}").json()["status"] == "working"
+
+
 def test_create_channel(client):
     pid = _make_project(client)
 
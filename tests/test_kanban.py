@@ -178,6 +178,20 @@ def test_filter_by_assignee(client):
 # ── Subtasks ───────────────────────────────────────────────────────────────
 
 
+def test_listing_names_each_assignee_and_blocker(client):
+    pid, aids, _ = _setup_project_with_agents(client)
+    first = _create_task(client, pid, "Schema", assigned_to=aids[0])
+    _create_task(client, pid, "API", assigned_to=aids[1], blocked_by=[first["id"]])
+    _create_task(client, pid, "Docs")
+
+    listed = {t["title"]: t for t in client.get(f"/api/tasks?project_id={pid}").json()["tasks"]}
+
+    assert {k: t["assigned_agent_name"] for k, t in listed.items()} == {
+        "Schema": "Agent-0", "API": "Agent-1", "Docs": None,
+    }
+    assert (listed["API"]["blocked_by_titles"], listed["API"]["is_blocked"]) == (["Schema"], True)
+
+
 def test_subtask_hierarchy(client):
     """Create a parent task with subtasks; verify parent_only default hides children."""
     pid, aids, _ = _setup_project_with_agents(client)
@@ -223,6 +237,17 @@ def test_blocking_sets_status_to_blocked(client):
     assert dependent["blocked_by_titles"] == ["Setup CI"]
 
 
+def test_only_open_blockers_block_a_new_task(client):
+    pid, _, _ = _setup_project_with_agents(client)
+    done = _create_task(client, pid, "Setup CI")
+    client.patch(f"/api/tasks/{done['id']}", json={"status": "completed"})
+
+    dependent = _create_task(client, pid, "Deploy", blocked_by=[done["id"], "missing"])
+
+    assert dependent["status"] == "pending"
+    assert dependent["blocked_by_titles"] == ["Setup CI"]
+
+
 def test_completing_blocker_unblocks_dependent(client):
     """When a blocker task is completed, dependent tasks should auto-unblock."""
     pid, aids, _ = _setup_project_with_agents(client)
@@ -309,3 +334,17 @@ def test_update_priority_and_description(client):
     updated = resp.json()
     assert updated["priority"] == 10
     assert updated["description"] == "Split into focused modules"
+
+
+def test_resuming_a_project_counts_its_in_progress_tasks(client):
+    pid, _, _ = _setup_project_with_agents(client, n_agents=1)
+    for title in ("Build API", "Write docs"):
+        task = _create_task(client, pid, title)
+        client.patch(f"/api/tasks/{task['id']}", json={"status": "in_progress"})
+    _create_task(client, pid, "Still pending")
+
+    client.post(f"/api/projects/{pid}/pause")
+    resp = client.post(f"/api/projects/{pid}/resume")
+
+    assert resp.status_code == 200
+    assert "2 task(s) in progress" in resp.json()["message"]
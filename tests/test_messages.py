@@ -0,0 +1,437 @@
+"""Tests for the messages router — slash commands, threads, listing."""
+
+import json
+
+
+def _make_channel(client) -> tuple[str, str]:
+    pid = client.post("/api/projects", json={"name": "Messages"}).json()["id"]
+    cid = client.post("/api/channels", json={
+        "project_id": pid,
+        "name": "general",
+        "type": "public",
+    }).json()["id"]
+    return pid, cid
+
+
+def _post(client, cid: str, content: str, **extra) -> dict:
+    resp = client.post("/api/messages", json={"channel_id": cid, "content": content, **extra})
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def _system_messages(client, cid: str) -> list[str]:
+    messages = client.get(f"/api/messages/channel/{cid}").json()["messages"]
+    return [m["content"] for m in messages if m["message_type"] == "system"]
+
+
+# ── Slash commands ──────────────────────────────────────────────────────────
+
+
+def test_memorize_stores_the_instruction(client):
+    pid, cid = _make_channel(client)
+
+    _post(client, cid, "/memorize Always write tests")
+
+    memories = client.get(f"/api/projects/{pid}").json()["config"]["memories"]
+    assert [m["instruction"] for m in memories] == ["Always write tests"]
+    assert any("Memorized" in c for c in _system_messages(client, cid))
+
+
+def test_memorize_without_an_instruction_does_nothing(client):
+    pid, cid = _make_channel(client)
+
+    _post(client, cid, "/memorize   ")
+
+    assert not (client.get(f"/api/projects/{pid}").json().get("config") or {}).get("memories")
+    assert _system_messages(client, cid) == []
+
+
+def test_command_names_are_case_insensitive(client):
+    _, cid = _make_channel(client)
+
+    _post(client, cid, "/MEMORIES")
+
+    assert any("No memories stored yet" in c for c in _system_messages(client, cid))
+
+
+def test_memories_lists_what_was_memorized(client):
+    _, cid = _make_channel(client)
+    _post(client, cid, "/memorize Use {braces} freely")
+    _post(client, cid, "/memories")
+
+    listing = _system_messages(client, cid)[-1]
+    assert listing.startswith("**Stored Memories (1)**")
+    assert "1. Use {braces} freely\n   _Added: " in listing
+    assert listing.endswith("_Use `/memorize <instruction>` to add more._")
+
+
+def test_a_command_must_be_the_whole_first_word(client):
+    _, cid = _make_channel(client)
+
+    _post(client, cid, "/memoriesplease")
+
+    assert _system_messages(client, cid) == []
+
+
+def test_memorize_appends_and_keeps_other_config(client):
+    pid, cid = _make_channel(client)
+    client.patch(f"/api/projects/{pid}", json={"config": {"theme": "dark"}})
+
+    _post(client, cid, "/memorize first")
+    _post(client, cid, "/memorize second")
+
+    config = client.get(f"/api/projects/{pid}").json()["config"]
+    assert config["theme"] == "dark"
+    assert [m["instruction"] for m in config["memories"]] == ["first", "second"]
+
+
+# ── Creating messages ──────────────────────────────────────────────────────
+
+
+def test_posting_to_a_missing_channel_is_404(client):
+    resp = client.post("/api/messages", json={"channel_id": "nope", "content": "hi"})
+    assert resp.status_code == 404
+
+
+def test_posting_as_a_missing_agent_is_404(client):
+    _, cid = _make_channel(client)
+    resp = client.post("/api/messages", json={
+        "channel_id": cid, "content": "hi", "agent_id": "nope",
+    })
+    assert resp.status_code == 404
+
+
+def test_replying_to_a_missing_thread_is_404(client):
+    _, cid = _make_channel(client)
+    resp = client.post("/api/messages", json={
+        "channel_id": cid, "content": "hi", "thread_id": "nope",
+    })
+    assert resp.status_code == 404
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+
+def test_a_new_message_is_broadcast_before_its_command_reply(client):
+    from teamwork.websocket import manager
+
+    _, cid = _make_channel(client)
+    socket = _Recorder()
+    manager.subscribe_to_channel(socket, cid)
+    try:
+        _post(client, cid, "/memories")
+    finally:
+        manager.unsubscribe_from_channel(socket, cid)
+
+    assert [(e["type"], e["data"]["message_type"]) for e in socket.sent] == [
+        ("message:new", "chat"), ("message:new", "system"),
+    ]
+
+
+# ── Webhook forwarding ─────────────────────────────────────────────────────
+
+
+def test_user_messages_reach_the_webhook_over_one_client(client):
+    import httpx
+    import respx
+
+    from teamwork.routers import messages as m
+    from teamwork.utils import http
+
+    created = client.post("/api/external/projects", json={
+        "name": "Forwarded", "webhook_url": "http://agent:9000/webhook",
+    }).json()
+    cid = created["channels"]["general"]
+
+    with respx.mock(assert_all_mocked=False) as router:
+        route = router.post("http://agent:9000/webhook").mock(return_value=httpx.Response(200))
+        _post(client, cid, "first")
+        first_client = m._webhook_client
+        _post(client, cid, "second")
+
+    sent = [json.loads(call.request.content)["content"] for call in route.calls]
+    assert sent == ["first", "second"]
+    assert m._webhook_client is first_client is not None
+    assert first_client is not http._client  # webhooks stay off the shared client
+
+
+def test_an_unreachable_webhook_is_reported_in_the_channel(client):
+    import httpx
+    import respx
+
+    created = client.post("/api/external/projects", json={
+        "name": "Unreachable", "webhook_url": "http://agent:9000/webhook",
+    }).json()
+    cid = created["channels"]["general"]
+
+    with respx.mock(assert_all_mocked=False) as router:
+        router.post("http://agent:9000/webhook").mock(side_effect=httpx.ConnectError("down"))
+        _post(client, cid, "hello?")
+
+    assert any("Failed to reach external agent" in c for c in _system_messages(client, cid))
+
+# ── Deleting ───────────────────────────────────────────────────────────────
+
+
+def test_deleting_removes_the_message(client):
+    _, cid = _make_channel(client)
+    mid = _post(client, cid, "Temporary")["id"]
+
+    assert client.delete(f"/api/messages/{mid}").status_code == 204
+    assert client.get(f"/api/messages/{mid}").status_code == 404
+
+
+def test_deleting_a_missing_message_is_404(client):
+    assert client.delete("/api/messages/nope").status_code == 404
+
+
+def test_deleting_a_thread_parent_keeps_its_replies(client):
+    _, cid = _make_channel(client)
+    parent = _post(client, cid, "parent")["id"]
+    reply = _post(client, cid, "reply", thread_id=parent)["id"]
+
+    client.delete(f"/api/messages/{parent}")
+
+    kept = client.get(f"/api/messages/{reply}").json()
+    assert kept["thread_id"] is None
+    listed = client.get(f"/api/messages/channel/{cid}").json()["messages"]
+    assert [m["id"] for m in listed] == [reply]
+
+
+# ── Threads ────────────────────────────────────────────────────────────────
+
+
+def test_thread_replies_are_paged_with_a_total(client):
+    _, cid = _make_channel(client)
+    parent = _post(client, cid, "parent")["id"]
+    for i in range(3):
+        _post(client, cid, f"reply {i}", thread_id=parent)
+
+    page = client.get(f"/api/messages/{parent}/thread?limit=2").json()
+
+    assert page["total"] == 3
+    assert page["has_more"] is True
+    assert [m["content"] for m in page["messages"]] == ["reply 0", "reply 1"]
+
+
+def test_thread_of_a_missing_message_is_404(client):
+    assert client.get("/api/messages/nope/thread").status_code == 404
+
+
+def test_a_thread_with_no_replies_is_empty(client):
+    _, cid = _make_channel(client)
+    parent = _post(client, cid, "parent")["id"]
+
+    page = client.get(f"/api/messages/{parent}/thread").json()
+
+    assert page == {"messages": [], "total": 0, "has_more": False}
+
+
+# ── Listing ────────────────────────────────────────────────────────────────
+
+
+def test_listing_names_senders_and_counts_replies(client):
+    pid, cid = _make_channel(client)
+    agent = client.post("/api/agents", json={
+        "project_id": pid, "name": "Ada", "role": "engineer",
+    }).json()
+    parent = _post(client, cid, "from the user")["id"]
+    _post(client, cid, "from ada", agent_id=agent["id"])
+    _post(client, cid, "r1", thread_id=parent)
+    _post(client, cid, "r2", thread_id=parent)
+
+    listed = {m["content"]: m for m in client.get(f"/api/messages/channel/{cid}").json()["messages"]}
+
+    assert listed["from the user"]["reply_count"] == 2
+    assert listed["from the user"]["agent_name"] is None
+    assert listed["from ada"]["reply_count"] == 0
+    assert (listed["from ada"]["agent_name"], listed["from ada"]["agent_role"]) == ("Ada", "engineer")
+
+
+def test_listing_totals_the_view_not_the_page(client):
+    _, cid = _make_channel(client)
+    parent = _post(client, cid, "parent")["id"]
+    for i in range(3):
+        _post(client, cid, f"top {i}")
+    _post(client, cid, "reply", thread_id=parent)
+
+    page = client.get(f"/api/messages/channel/{cid}?limit=2").json()
+    thread = client.get(f"/api/messages/channel/{cid}?thread_id={parent}").json()
+
+    assert (page["total"], page["has_more"], len(page["messages"])) == (4, True, 2)
+    assert (thread["total"], [m["content"] for m in thread["messages"]]) == (1, ["reply"])
+
+
+def test_an_oversized_message_is_rejected(client):
+    from teamwork.routers.messages import MAX_MESSAGE_CHARS
+
+    _, cid = _make_channel(client)
+    resp = client.post("/api/messages", json={
+        "channel_id": cid, "content": "x" * (MAX_MESSAGE_CHARS + 1),
+    })
+    assert resp.status_code == 422
+
+
+def test_broadcasts_carry_a_preview_of_long_messages():
+    from teamwork.routers.messages import BROADCAST_PREVIEW_CHARS, broadcast_content
+
+    assert broadcast_content("short") == {"content": "short"}
+    long = "y" * (BROADCAST_PREVIEW_CHARS + 10)
+    assert broadcast_content(long) == {
+        "content": long[:BROADCAST_PREVIEW_CHARS], "content_truncated": True,
+    }
+
+
+def test_stats_bucket_a_projects_messages_by_age(client):
+    from datetime import datetime, timedelta
+
+    created = client.post("/api/external/projects", json={
+        "name": "Aged", "webhook_url": "http://agent:9000/webhook",
+    }).json()
+    pid, cid = created["project_id"], created["channels"]["general"]
+    now = datetime.utcnow()
+    client.post(f"/api/external/projects/{pid}/messages/bulk", json={"messages": [
+        {"channel_id": cid, "content": str(days),
+         "created_at": (now - timedelta(days=days)).isoformat()}
+        for days in (1, 10, 60, 200, 300)
+    ]})
+    _, other_cid = _make_channel(client)
+    _post(client, other_cid, "another project's message is not counted")
+
+    stats = client.get(f"/api/messages/stats/{pid}").json()
+
+    assert {k: stats[k] for k in (
+        "total", "last_7_days", "last_30_days", "last_90_days", "older_than_90_days",
+    )} == {"total": 5, "last_7_days": 1, "last_30_days": 2, "last_90_days": 3,
+           "older_than_90_days": 2}
+    assert client.get("/api/messages/stats/nope").json()["total"] == 0
+
+
+# ── Compactify ─────────────────────────────────────────────────────────────
+
+
+def test_compactify_replaces_old_messages_with_a_summary(client):
+    import httpx
+    import respx
+
+    created = client.post("/api/external/projects", json={
+        "name": "Old", "webhook_url": "http://agent:9000/webhook",
+    }).json()
+    pid, cid = created["project_id"], created["channels"]["general"]
+    client.post(f"/api/external/projects/{pid}/messages/bulk", json={"messages": [
+        *({"channel_id": cid, "content": f"old {i}", "created_at": f"2020-01-0{i + 1}T00:00:00"}
+          for i in range(3)),
+        {"channel_id": cid, "content": "recent"},
+    ]})
+
+    llm = "http://llm.test/v1/chat/completions"
+    with respx.mock(assert_all_mocked=False) as router:
+        route = router.post(llm).mock(return_value=httpx.Response(200, json={
+            "choices": [{"message": {"content": "- three old messages"}}],
+        }))
+        resp = client.post("/api/messages/compactify", json={
+            "project_id": pid, "older_than_days": 30,
+            "openai_api_key": "k", "api_base_url": llm,
+        }).json()
+
+    assert (resp["messages_removed"], resp["summaries_created"]) == (3, 1)
+    transcript = json.loads(route.calls[0].request.content)["messages"][1]["content"]
+    assert "[2020-01-01 00:00] User: old 0" in transcript
+    contents = [m["content"] for m in client.get(f"/api/messages/channel/{cid}").json()["messages"]]
+    assert contents == ["**[Summary of 3 messages]**\n\n- three old messages", "recent"]
+
+
+async def test_summarizer_calls_reuse_one_client():
+    import httpx
+    import respx
+
+    from teamwork.routers import messages as m
+    from teamwork.utils import http
+
+    llm = "http://llm.test/v1/chat/completions"
+    with respx.mock(assert_all_mocked=False) as router:
+        router.post(llm).mock(return_value=httpx.Response(200, json={
+            "choices": [{"message": {"content": " summary "}}],
+        }))
+        assert await m._llm_summarize("a", "k", api_base_url=llm) == "summary"
+        first_client = http._client
+        assert await m._llm_summarize("b", "k", api_base_url=llm) == "summary"
+
+    assert http._client is first_client is not None
+    await http.close_http_client()
+
+
+async def test_every_summary_is_authenticated_upstream():
+    import httpx
+    import respx
+
+    from teamwork.routers import messages as m
+    from teamwork.utils import http
+
+    llm = "http://llm.test/v1/chat/completions"
+    with respx.mock(assert_all_mocked=False) as router:
+        route = router.post(llm).mock(side_effect=[
+            httpx.Response(200, json={"choices": [{"message": {"content": "one"}}]}),
+            httpx.Response(401),
+        ])
+        assert await m._llm_summarize("same", "k", api_base_url=llm) == "one"
+        # Another caller's key never gets a summary someone else paid for.
+        assert await m._llm_summarize("same", "other-key", api_base_url=llm) is None
+
+    assert [c.request.headers["authorization"] for c in route.calls] == [
+        "Bearer k", "Bearer other-key",
+    ]
+    await http.close_http_client()
+
+
+async def test_a_rate_limited_summary_waits_and_retries_once(monkeypatch):
+    import httpx
+    import respx
+
+    from teamwork.routers import messages as m
+    from teamwork.utils import http
+
+    waits = []
+
+    async def no_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(m.asyncio, "sleep", no_sleep)
+    llm = "http://llm.test/v1/chat/completions"
+    with respx.mock(assert_all_mocked=False) as router:
+        route = router.post(llm).mock(side_effect=[
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]}),
+            httpx.Response(429, headers={"Retry-After": "3600"}),
+            httpx.Response(429),
+        ])
+        assert await m._llm_summarize("first", "k", api_base_url=llm) == "ok"
+        assert await m._llm_summarize("second", "k", api_base_url=llm) is None
+
+    assert route.call_count == 4
+    assert waits == [2.0, m._MAX_RETRY_AFTER]
+    await http.close_http_client()
+
+
+# ── Search ─────────────────────────────────────────────────────────────────
+
+
+def test_search_names_the_sender_of_each_hit(client):
+    pid, cid = _make_channel(client)
+    agent = client.post("/api/agents", json={
+        "project_id": pid, "name": "Ada", "role": "engineer",
+    }).json()
+    _post(client, cid, "deploy the widget", agent_id=agent["id"])
+    _post(client, cid, "widget looks good")
+
+    found = client.get("/api/messages/search", params={"q": "widget", "project_id": pid}).json()
+
+    assert found["total"] == 2
+    assert sorted((h["content"], h["agent_name"]) for h in found["results"]) == [
+        ("deploy the widget", "Ada"), ("widget looks good", None),
+    ]
@@ -87,6 +87,15 @@ def test_health_is_exempt(monkeypatch):
     assert client.get("/health").status_code == 200
 
 
+def test_exemption_covers_subpaths_but_not_lookalikes(monkeypatch):
+    cfg = ProxyAuthConfig(_settings(proxy_auth_provider="iap", proxy_auth_audience="aud"))
+    mw = ProxyAuthMiddleware(FastAPI(), config=cfg)
+    assert mw._is_exempt("/healthz")
+    assert mw._is_exempt("/health/live")
+    assert not mw._is_exempt("/healthcheck")
+    assert not mw._is_exempt("/api/health")
+
+
 def test_valid_token_passes_and_sets_identity(monkeypatch):
     client = _app(monkeypatch, verify_returns={"email": "alice@example.com"})
     r = client.get("/api/secret", headers={"x-goog-iap-jwt-assertion": "tok"})
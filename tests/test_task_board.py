@@ -0,0 +1,182 @@
+"""Tests for the task-board aggregation used by external agents."""
+
+from datetime import datetime
+
+from teamwork.models import Project, Task
+from teamwork.routers.messages import get_project_task_board
+
+
+async def _board(db, *tasks: Task) -> dict:
+    db.add_all([Project(id="p1", name="Board"), Project(id="p2", name="Other"), *tasks])
+    await db.commit()
+    return await get_project_task_board(db, "p1")
+
+
+def _titles(tasks: list[dict]) -> list[str]:
+    return [t["title"] for t in tasks]
+
+
+async def test_a_task_waits_on_an_unfinished_blocker(db_session):
+    blocker = Task(id="t1", project_id="p1", title="schema", status="in_progress")
+    waiting = Task(id="t2", project_id="p1", title="api", status="pending")
+    waiting.blocked_by = ["t1"]
+
+    board = await _board(db_session, blocker, waiting)
+
+    assert _titles(board["blocked_tasks"]) == ["api"]
+    assert board["blocked_tasks"][0]["blocked_by"] == ["t1"]
+    assert board["todo_tasks"] == []
+
+
+async def test_finished_or_missing_blockers_leave_the_task_todo(db_session):
+    done = Task(id="t1", project_id="p1", title="schema", status="completed")
+    ready = Task(id="t2", project_id="p1", title="api", status="pending")
+    ready.blocked_by = ["t1", "gone"]
+
+    board = await _board(db_session, done, ready)
+
+    assert _titles(board["todo_tasks"]) == ["api"]
+    assert board["blocked_count"] == 0
+
+
+async def test_a_blocker_in_another_project_is_still_honoured(db_session):
+    elsewhere = Task(id="x1", project_id="p2", title="upstream", status="pending")
+    waiting = Task(id="t2", project_id="p1", title="api", status="pending")
+    waiting.blocked_by = ["x1"]
+
+    board = await _board(db_session, elsewhere, waiting)
+
+    assert _titles(board["blocked_tasks"]) == ["api"]
+
+
+def test_workspace_listing_skips_vendored_dirs_and_stops_at_the_limit(tmp_path):
+    from teamwork.routers.messages import _list_workspace_files
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("")
+    for i in range(5):
+        (tmp_path / f"note{i}.md").write_text("")
+
+    listed = set(_list_workspace_files(str(tmp_path), 20))
+    assert listed == {"src/app.py", *(f"note{i}.md" for i in range(5))}
+    assert len(_list_workspace_files(str(tmp_path), 3)) == 3
+
+
+def test_a_burst_of_status_reads_walks_the_workspace_once(tmp_path, monkeypatch):
+    from teamwork.routers import messages as m
+
+    (tmp_path / "a.txt").write_text("")
+    assert m._cached_workspace_files(str(tmp_path)) == ["a.txt"]
+
+    (tmp_path / "b.txt").write_text("")
+    assert m._cached_workspace_files(str(tmp_path)) == ["a.txt"]
+
+    monkeypatch.setattr(m, "_WORKSPACE_LISTING_TTL", 0.0)
+    assert sorted(m._cached_workspace_files(str(tmp_path))) == ["a.txt", "b.txt"]
+
+
+def test_an_unreadable_workspace_is_logged_not_hidden(tmp_path, monkeypatch, caplog):
+    from teamwork.routers import messages as m
+
+    def denied(root, limit):
+        raise PermissionError("denied")
+
+    monkeypatch.setattr(m, "_list_workspace_files", denied)
+
+    assert m._workspace_files_or_empty(str(tmp_path)) == []
+    assert "denied" in caplog.text
+
+
+async def test_agent_statuses_tally_tasks_and_name_the_current_one(db_session):
+    from teamwork.models import Agent
+
+    ada = Agent(id="a1", project_id="p1", name="Ada", role="engineer")
+    tasks = [
+        Task(id="t1", project_id="p1", title="done", status="completed", assigned_to="a1"),
+        Task(id="t2", project_id="p1", title="older", status="pending", assigned_to="a1"),
+        Task(id="t3", project_id="p1", title="newer", status="in_progress", assigned_to="a1"),
+    ]
+    for i, task in enumerate(tasks):
+        task.created_at = datetime(2026, 1, 1 + i)
+
+    board = await _board(db_session, ada, *tasks)
+
+    (status,) = board["agent_statuses"]
+    assert (status["assigned_tasks"], status["completed_tasks"]) == (3, 1)
+    assert status["current_task"] == {"title": "newer", "status": "in_progress"}
+
+
+async def test_board_descriptions_are_cut_to_a_preview(db_session):
+    long = Task(id="t1", project_id="p1", title="spec", status="pending", description="x" * 500)
+    bare = Task(id="t2", project_id="p1", title="bare", status="pending")
+
+    board = await _board(db_session, long, bare)
+
+    assert [t["description"] for t in board["todo_tasks"]] == ["x" * 100, ""]
+
+
+async def test_an_idle_agent_without_a_workspace_reports_no_work(db_session, tmp_path, monkeypatch):
+    from teamwork.config import settings
+    from teamwork.routers.messages import get_agent_real_work_status
+
+    monkeypatch.setattr(settings, "workspace_path", tmp_path / "missing")
+    db_session.add(Project(id="p1", name="Idle"))
+    await db_session.commit()
+
+    status = await get_agent_real_work_status(db_session, "a1", "p1")
+
+    assert status["files_created"] == []
+    assert status["summary"].startswith("No work has been done yet.")
+
+
+async def test_work_status_reports_the_current_and_recently_completed_tasks(db_session):
+    from teamwork.routers.messages import get_agent_real_work_status
+
+    tasks = [
+        Task(id=f"d{i}", project_id="p1", title=f"done {i}", status="completed",
+             assigned_to="a1", updated_at=datetime(2026, 1, 1 + i))
+        for i in range(7)
+    ]
+    tasks += [
+        Task(id="o1", project_id="p1", title="older open", status="pending",
+             assigned_to="a1", created_at=datetime(2026, 2, 1)),
+        Task(id="o2", project_id="p1", title="newer open", status="in_progress",
+             assigned_to="a1", description="the details", created_at=datetime(2026, 2, 2)),
+    ]
+    db_session.add_all([Project(id="p1", name="Busy"), *tasks])
+    await db_session.commit()
+
+    status = await get_agent_real_work_status(db_session, "a1", "p1")
+
+    assert status["current_task"] == {
+        "title": "newer open", "status": "in_progress", "description": "the details",
+    }
+    assert [t["title"] for t in status["completed_tasks"]] == [f"done {i}" for i in (6, 5, 4, 3, 2)]
+    assert "Currently assigned: newer open (in_progress)" in status["summary"]
+
+
+async def test_concurrent_status_requests_share_one_workspace_walk(tmp_path, monkeypatch):
+    import asyncio
+    import time
+
+    from teamwork.routers import messages
+
+    walks = []
+
+    def slow_walk(root, limit):
+        walks.append(root)
+        time.sleep(0.1)
+        return ["app.py"]
+
+    monkeypatch.setattr(messages, "_list_workspace_files", slow_walk)
+    monkeypatch.setattr(messages, "_workspace_listings", {})
+
+    listings = await asyncio.gather(*(messages._workspace_files(str(tmp_path)) for _ in range(3)))
+
+    assert listings == [["app.py"]] * 3
+    assert walks == [str(tmp_path)]
+    assert messages._workspace_walks == {}
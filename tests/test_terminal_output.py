@@ -0,0 +1,112 @@
+"""Tests for terminal output buffering, cleanup, and capability checks."""
+
+from teamwork.routers.terminal import TerminalSession, _strip_terminal_noise
+
+
+def _session(*chunks: str) -> TerminalSession:
+    session = TerminalSession(master_fd=-1, process=None)
+    for chunk in chunks:
+        session.record_output(chunk)
+    return session
+
+
+def test_replay_returns_everything_under_the_cap():
+    assert _session("ab", "cd").replay_text(max_bytes=10) == "abcd"
+
+
+def test_replay_keeps_only_the_newest_output_over_the_cap():
+    session = _session("old-", "0123", "4567")
+
+    assert session.replay_text(max_bytes=6) == "234567"
+    assert session.replay_text(max_bytes=8) == "01234567"
+
+
+def test_terminal_noise_is_stripped_in_one_pass():
+    raw = "\x1b]0;title\x07\x1b[?2004l$ ls\r\n\x1b[01;34msrc\x1b[0m\r\n"
+    assert _strip_terminal_noise(raw) == "$ ls\nsrc\n"
+
+
+async def test_exec_returns_once_the_output_goes_quiet(monkeypatch):
+    import asyncio
+    import os
+    import time
+
+    from teamwork.routers import terminal
+
+    read_end, write_end = os.pipe()
+    session = TerminalSession(master_fd=write_end, process=None)
+    monkeypatch.setitem(terminal._active_sessions, "p1", session)
+
+    async def shell():
+        for line in ("\x1b[01mone\x1b[0m\r\n", "two\r\n"):
+            await asyncio.sleep(0.05)
+            session.record_output(line)
+
+    started = time.monotonic()
+    writer = asyncio.create_task(shell())
+    body = terminal.TerminalExecRequest(command="ls", timeout=30.0)
+    result = await terminal.terminal_exec("p1", body)
+    elapsed = time.monotonic() - started
+    await writer
+    os.close(read_end)
+    os.close(write_end)
+
+    # Both chunks arrive well inside the 0.3s quiet period of each other, so both are
+    # captured; the call still ends on the silence, long before the timeout.
+    assert result == {"output": "one\ntwo"}
+    assert elapsed < body.timeout / 2
+
+
+async def test_concurrent_execs_on_one_session_both_see_the_output(monkeypatch):
+    import asyncio
+    import os
+
+    from teamwork.routers import terminal
+
+    read_end, write_end = os.pipe()
+    session = TerminalSession(master_fd=write_end, process=None)
+    monkeypatch.setitem(terminal._active_sessions, "p1", session)
+
+    async def shell():
+        for line in ("one\r\n", "two\r\n", "three\r\n"):
+            await asyncio.sleep(0.05)
+            session.record_output(line)
+
+    writer = asyncio.create_task(shell())
+    body = terminal.TerminalExecRequest(command="ls", timeout=30.0)
+    first, second = await asyncio.wait_for(
+        asyncio.gather(terminal.terminal_exec("p1", body), terminal.terminal_exec("p1", body)),
+        body.timeout / 2,
+    )
+    await writer
+    os.close(read_end)
+    os.close(write_end)
+
+    assert first == second == {"output": "one\ntwo\nthree"}
+
+
+async def test_recent_returns_the_last_lines_of_a_long_buffer(monkeypatch):
+    from teamwork.routers import terminal
+
+    session = _session(*(f"\x1b[32mline {i}\x1b[0m\r\n" for i in range(1500)), "$ \r\n\r\n")
+    monkeypatch.setitem(terminal._active_sessions, "p1", session)
+
+    assert (await terminal.terminal_recent("p1", lines=3))["output"] == "line 1498\nline 1499\n$"
+    everything = (await terminal.terminal_recent("p1", lines=5000))["output"].split("\n")
+    assert (everything[0], len(everything)) == ("line 0", 1501)
+
+
+async def test_terminal_info_looks_docker_up_once(monkeypatch):
+    from teamwork.config import settings
+    from teamwork.routers import terminal
+
+    lookups = []
+    monkeypatch.setattr(terminal.shutil, "which", lambda name: lookups.append(name))
+    monkeypatch.setattr(settings, "sandbox_container", "")
+    terminal._docker_cli.cache_clear()
+
+    infos = [await terminal.get_terminal_info() for _ in range(3)]
+
+    assert [i.docker_available for i in infos] == [False] * 3
+    assert lookups == ["docker"]
+    terminal._docker_cli.cache_clear()
@@ -0,0 +1,19 @@
+"""Tests for workspace file uploads."""
+
+from teamwork.config import settings
+
+
+def test_an_upload_name_cannot_escape_the_uploads_directory(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "workspace_path", tmp_path)
+    pid = client.post("/api/projects", json={"name": "Uploads"}).json()["id"]
+
+    resp = client.post(
+        f"/api/uploads/{pid}",
+        files={"file": ("../a\\b.txt", b"hello", "text/plain")},
+    )
+
+    assert resp.status_code == 200
+    stored = resp.json()["url"].rsplit("/", 1)[-1]
+    assert stored.endswith("_.._a_b.txt")
+    [written] = tmp_path.rglob("*.txt")
+    assert (written.parent.name, written.read_bytes()) == ("_uploads", b"hello")
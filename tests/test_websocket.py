@@ -0,0 +1,178 @@
+"""Tests for WebSocket event serialization and fan-out."""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from teamwork.websocket import EventType, WebSocketEvent
+from teamwork.websocket.connection_manager import ConnectionManager
+
+
+def test_event_serializes_to_the_wire_shape():
+    event = WebSocketEvent(
+        type=EventType.MESSAGE_NEW, data={"id": "m1"}, timestamp="t", channel_id="c1",
+    )
+
+    assert json.loads(event.to_json()) == {
+        "type": "message:new",
+        "data": {"id": "m1"},
+        "timestamp": "t",
+        "projectId": None,
+        "channelId": "c1",
+    }
+
+
+def test_datetimes_serialize_like_isoformat():
+    # Handlers put raw datetimes in the payload; the UI must see the same
+    # string the REST responses give it.
+    for when in (datetime(2026, 1, 2, 3, 4, 5, 678901), datetime(2026, 1, 2, 3, 4, 5)):
+        event = WebSocketEvent(type=EventType.MESSAGE_NEW, data={"created_at": when})
+        assert json.loads(event.to_json())["data"]["created_at"] == when.isoformat()
+
+
+def test_events_do_not_carry_an_instance_dict():
+    event = WebSocketEvent(type=EventType.MESSAGE_NEW, data={})
+    assert not hasattr(event, "__dict__")
+
+
+class _Socket:
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.delay, self.fail, self.sent, self.closed = delay, fail, [], []
+
+    async def send_text(self, text: str) -> None:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("closed")
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed.append(code)
+
+
+async def test_a_broadcast_reaches_subscribers_concurrently_and_drops_dead_ones():
+    manager = ConnectionManager()
+    first, second, dead = _Socket(delay=0.2), _Socket(delay=0.2), _Socket(fail=True)
+    for ws in (first, second, dead):
+        manager.subscribe_to_channel(ws, "c1")
+
+    started = time.monotonic()
+    await manager.broadcast_to_channel("c1", WebSocketEvent(type=EventType.MESSAGE_NEW, data={}))
+
+    assert time.monotonic() - started < 0.35
+    assert [e["channelId"] for e in first.sent + second.sent] == ["c1", "c1"]
+    assert dead not in manager._channel_connections["c1"]
+    assert dead.closed == [1011]
+
+
+async def test_a_broadcast_serializes_the_event_once(monkeypatch):
+    manager = ConnectionManager()
+    sockets = [_Socket() for _ in range(3)]
+    for ws in sockets:
+        manager.subscribe_to_project(ws, "p1")
+    event = WebSocketEvent(type=EventType.TASK_NEW, data={})
+    calls = []
+    original = WebSocketEvent.to_json
+    monkeypatch.setattr(WebSocketEvent, "to_json", lambda self: calls.append(1) or original(self))
+
+    await manager.broadcast_to_project("p1", event)
+
+    assert len(calls) == 1
+    assert all(ws.sent[0]["projectId"] == "p1" for ws in sockets)
+
+
+async def test_a_channel_and_project_broadcast_reaches_each_socket_once():
+    manager = ConnectionManager()
+    both, channel_only, project_only = _Socket(), _Socket(), _Socket()
+    for ws in (both, channel_only):
+        manager.subscribe_to_channel(ws, "c1")
+    for ws in (both, project_only):
+        manager.subscribe_to_project(ws, "p1")
+
+    await manager.broadcast_to_channel_and_project(
+        "c1", "p1", WebSocketEvent(type=EventType.MESSAGE_NEW, data={}),
+    )
+
+    assert [len(ws.sent) for ws in (both, channel_only, project_only)] == [1, 1, 1]
+    assert (both.sent[0]["channelId"], both.sent[0]["projectId"]) == ("c1", "p1")
+
+
+async def test_a_large_broadcast_bounds_its_sends_in_flight(monkeypatch):
+    from teamwork.websocket import connection_manager
+
+    monkeypatch.setattr(connection_manager, "_FAN_OUT_BATCH", 4)
+    manager = ConnectionManager()
+    in_flight, peak = 0, 0
+
+    class _Counting(_Socket):
+        async def send_text(self, text: str) -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            await super().send_text(text)
+
+    sockets = [_Counting() for _ in range(10)] + [_Socket(fail=True)]
+    for ws in sockets:
+        manager.subscribe_to_channel(ws, "c1")
+
+    await manager.broadcast_to_channel("c1", WebSocketEvent(type=EventType.MESSAGE_NEW, data={}))
+
+    assert peak <= 4
+    assert all(len(ws.sent) == 1 for ws in sockets[:10])
+    assert len(manager._channel_connections["c1"]) == 10
+
+
+async def test_a_stalled_socket_does_not_hold_up_later_sends(monkeypatch):
+    from teamwork.websocket import connection_manager
+
+    monkeypatch.setattr(connection_manager, "_FAN_OUT_BATCH", 4)
+    monkeypatch.setattr(connection_manager, "_SEND_TIMEOUT", 1.0)
+    manager = ConnectionManager()
+    others = [_Socket() for _ in range(10)]
+
+    class _Stalled(_Socket):
+        async def send_text(self, text: str) -> None:
+            # Only finishes once every other socket has its frame, which it
+            # never would if sends ran in lockstep batches behind it.
+            while not all(ws.sent for ws in others):
+                await asyncio.sleep(0.01)
+            await super().send_text(text)
+
+    stalled = _Stalled()
+    for ws in [stalled, *others]:
+        manager.subscribe_to_channel(ws, "c1")
+
+    event = WebSocketEvent(type=EventType.MESSAGE_NEW, data={}, channel_id="c1")
+    await manager._fan_out([stalled, *others], event)
+
+    assert all(len(ws.sent) == 1 for ws in [stalled, *others])
+    assert len(manager._channel_connections["c1"]) == 11
+
+
+async def test_a_send_that_times_out_drops_the_connection(monkeypatch):
+    from teamwork.websocket import connection_manager
+
+    monkeypatch.setattr(connection_manager, "_SEND_TIMEOUT", 0.01)
+    manager = ConnectionManager()
+
+    class _Hung(_Socket):
+        async def send_text(self, text: str) -> None:
+            await asyncio.Event().wait()
+
+    hung, fine = _Hung(), _Socket()
+    for ws in (hung, fine):
+        manager.subscribe_to_channel(ws, "c1")
+
+    await manager.broadcast_to_channel("c1", WebSocketEvent(type=EventType.MESSAGE_NEW, data={}))
+
+    assert len(fine.sent) == 1
+    assert manager._channel_connections["c1"] == {fine}
+    # Closed, not just unsubscribed, so the client notices and reconnects.
+    assert (hung.closed, fine.closed) == ([1011], [])
+
+
+def test_the_default_timestamp_serializes_like_isoformat():
+    event = WebSocketEvent(type=EventType.MESSAGE_NEW, data={})
+    assert json.loads(event.to_json())["timestamp"] == event.timestamp.isoformat()
@@ -0,0 +1,65 @@
+"""Tests for the workspace file browser."""
+
+from teamwork.routers.workspace import build_file_tree
+
+
+def test_file_tree_lists_directories_first_and_skips_ignored_names(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print()")
+    (tmp_path / "src" / "app.pyc").write_bytes(b"")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "README.md").write_text("hi")
+    (tmp_path / "api").mkdir()
+
+    tree = build_file_tree(tmp_path, tmp_path)
+
+    assert [(n.name, n.type) for n in tree] == [
+        ("api", "directory"), ("src", "directory"), ("README.md", "file"),
+    ]
+    assert tree[0].children is None
+    [app] = tree[1].children
+    assert (app.path, app.size) == ("src/app.py", 7)
+
+
+def test_file_tree_stops_at_max_depth(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "deep.txt").write_text("")
+
+    [a] = build_file_tree(tmp_path, tmp_path, max_depth=2)
+
+    assert a.children[0].path == "a/b"
+    assert a.children[0].children is None
+
+
+def test_task_diff_reports_the_commits_stats_and_diff_of_its_range(client, tmp_path, monkeypatch):
+    import subprocess
+
+    from teamwork.config import settings
+
+    monkeypatch.setattr(settings, "workspace_path", tmp_path)
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=T", "-c", "user.email=t@t", *args],
+                       cwd=repo, check=True, capture_output=True)
+
+    git("init", "-q")
+    (repo / "a.txt").write_text("one\n")
+    git("add", ".")
+    git("commit", "-qm", "root")
+    (repo / "a.txt").write_text("one\ntwo\nthree\n")
+    git("commit", "-qam", "grow a")
+
+    pid = client.post("/api/external/projects", json={
+        "name": "Diffs", "webhook_url": "http://agent:9000/webhook", "workspace_dir": "repo",
+    }).json()["project_id"]
+    tid = client.post("/api/tasks", json={"project_id": pid, "title": "grow"}).json()["id"]
+
+    diff = client.get(f"/api/workspace/{pid}/task/{tid}/diff").json()
+
+    assert diff["error"] is None
+    assert [c["message"] for c in diff["commits"]] == ["grow a"]
+    assert (diff["files_changed"], diff["total_additions"], diff["total_deletions"]) == (1, 2, 0)
+    assert diff["files"][0]["path"] == "a.txt"
+    assert "+three" in diff["files"][0]["diff"]